@@ -1,128 +1,224 @@
+import asyncio
 import logging
 from nodestream.pipeline import Extractor
-import os
 from typing import Any
-from sbom_writer import CycloneDXWriter
+from sbom_writer import AttributeProjection, CycloneDXWriter
 import boto3
-import time
 from botocore.client import Config
-from pathlib import Path
 import json
-import shutil
+from sbom_profiler import SBOMProfiler
 
 
 class AmazonInspectorSBOMExtractor(Extractor):
     bearer_token: str = None
+    _DONE = object()
 
-    def __init__(self, bucketName: str, keyPrefix: str, kmsKeyArn: str) -> None:
-        """The function init, which starts the SBOM export
+    def __init__(
+        self,
+        bucketName: str,
+        keyPrefix: str,
+        kmsKeyArn: str,
+        targets: list[dict] = None,
+        pollInterval: int = 30,
+        endpointUrl: str = None,
+        projection: dict = None,
+        profiling: dict = None,
+    ) -> None:
+        """The function init, which configures the SBOM exports to run
 
         Args:
             bucketName (str): The S3 bucket name for export
             keyPrefix (str): The S3 bucket key for export
             kmsKeyArn (str): The KMS key used to encrypt the export
+            targets (list[dict], optional): The accounts and regions to export from. Each
+                target may set `region`, `roleArn`, `bucketName`, `keyPrefix` and
+                `kmsKeyArn`, falling back to the top level values. Defaults to a single
+                target using the default credentials and region.
+            pollInterval (int, optional): Seconds between export status checks. Defaults to 30.
+            endpointUrl (str, optional): An endpoint override for the AWS clients, for
+                use with local AWS stand-ins. Defaults to None.
+            projection (dict, optional): The attribute projection rules by node label. Defaults to None.
+            profiling (dict, optional): The profiling settings for slow SBOMs. Defaults to None.
         """
         self.bucketName = bucketName
         self.keyPrefix = keyPrefix
         self.kmsKeyArn = kmsKeyArn
+        self.targets = targets or [{}]
+        self.pollInterval = pollInterval
+        self.endpointUrl = endpointUrl
+        self.projection = AttributeProjection(projection)
+        self.profiler = SBOMProfiler(profiling)
         self.logger = logging.getLogger(self.__class__.__name__)
-        report_id = self.start_sbom_export()
-        self.logger.info(f"Report ID: {report_id}")
-        successful = self.check_for_export_complete(report_id)
-        if successful:
-            self.logger.info("SBOM export successful")
-            self.keyPrefix = self.keyPrefix + f"CYCLONEDX_1_4_outputs_{report_id}/"
-            self.download_s3_dir()
-        else:
-            self.logger.error("SBOM export failed")
-
-    def start_sbom_export(self) -> str:
+
+    def create_session(self, target: dict) -> boto3.Session:
+        """Creates the boto3 session for a target, assuming its role if one is set
+
+        Args:
+            target (dict): The target to create the session for
+
+        Returns:
+            boto3.Session: The session to create clients from
+        """
+        region = target.get("region")
+        if "roleArn" not in target:
+            return boto3.Session(region_name=region)
+
+        # boto3's default session is not thread safe, and targets are set up concurrently
+        sts = boto3.Session(region_name=region).client(
+            "sts", endpoint_url=self.endpointUrl
+        )
+        credentials = sts.assume_role(
+            RoleArn=target["roleArn"],
+            RoleSessionName="AmazonInspectorSBOMExtractor",
+        )["Credentials"]
+        return boto3.Session(
+            aws_access_key_id=credentials["AccessKeyId"],
+            aws_secret_access_key=credentials["SecretAccessKey"],
+            aws_session_token=credentials["SessionToken"],
+            region_name=region,
+        )
+
+    def start_sbom_export(self, client, target: dict) -> str:
         """Starts an SBOM export
 
+        Args:
+            client: The inspector2 client for the target
+            target (dict): The target to export from
+
         Returns:
             str: The report_id for the export
         """
-        self.client = boto3.client("inspector2")
-        response = self.client.create_sbom_export(
+        response = client.create_sbom_export(
             reportFormat="CYCLONEDX_1_4",
             s3Destination={
-                "bucketName": self.bucketName,
-                "keyPrefix": self.keyPrefix,
-                "kmsKeyArn": self.kmsKeyArn,
+                "bucketName": target.get("bucketName", self.bucketName),
+                "keyPrefix": target.get("keyPrefix", self.keyPrefix),
+                "kmsKeyArn": target.get("kmsKeyArn", self.kmsKeyArn),
             },
         )
 
         return response["reportId"]
 
-    def check_for_export_complete(self, report_id: str) -> bool:
+    async def check_for_export_complete(self, client, report_id: str) -> bool:
         """Checks to see if the specified export is complete
 
         Args:
+            client: The inspector2 client the export was started with
             report_id (str): The export report id to check
 
         Returns:
             bool: True if successful, False if not
         """
         while True:
-            time.sleep(30)
-            self.logger.info("Checking for SBOM export completion")
-            response = self.client.get_sbom_export(reportId=report_id)
-            self.logger.info(f"Current Status: {response['status']}")
+            await asyncio.sleep(self.pollInterval)
+            self.logger.info(f"Checking for SBOM export completion of {report_id}")
+            response = await asyncio.to_thread(
+                client.get_sbom_export, reportId=report_id
+            )
+            self.logger.info(f"Current Status of {report_id}: {response['status']}")
             if not response["status"] == "IN_PROGRESS":
                 if response["status"] == "SUCCEEDED":
                     return True
                 else:
                     return False
 
-    def download_s3_dir(self):
-        """This downloads an entire bucket/key and sub keys from S3 to a local /tmp directory"""
-        if os.path.exists("tmp"):
-            shutil.rmtree("tmp")
+    def list_s3_keys(self, s3_client, bucket_name: str, key_prefix: str) -> list[str]:
+        """Lists the SBOM object keys under a bucket/key and sub keys
+
+        Args:
+            s3_client: The S3 client to list with
+            bucket_name (str): The bucket the export was written to
+            key_prefix (str): The key prefix of the export output
 
-        s3_client = boto3.client("s3", config=Config(signature_version="s3v4"))
+        Returns:
+            list[str]: The keys of the SBOM objects
+        """
         keys = []
-        dirs = []
-        next_token = ""
-        base_kwargs = {
-            "Bucket": self.bucketName,
-            "Prefix": self.keyPrefix,
-        }
-        while next_token is not None:
-            kwargs = base_kwargs.copy()
-            if next_token != "":
-                kwargs.update({"ContinuationToken": next_token})
-            results = s3_client.list_objects_v2(**kwargs)
-            contents = results.get("Contents")
-            for i in contents:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=key_prefix):
+            for i in page.get("Contents", []):
                 k = i.get("Key")
-                if k[-1] != "/":
+                if k.endswith(".json"):
                     keys.append(k)
-                else:
-                    dirs.append(k)
-            next_token = results.get("NextContinuationToken")
-        for d in dirs:
-            dest_pathname = os.path.join("tmp", d)
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-        for k in keys:
-            dest_pathname = os.path.join("tmp", k)
-            if not os.path.exists(os.path.dirname(dest_pathname)):
-                os.makedirs(os.path.dirname(dest_pathname))
-            s3_client.download_file(self.bucketName, k, dest_pathname)
+        return sorted(keys)
+
+    def read_s3_object(self, s3_client, bucket_name: str, key: str) -> dict:
+        """Reads and parses a single SBOM object from S3
+
+        Returns:
+            dict: The parsed SBOM
+        """
+        response = s3_client.get_object(Bucket=bucket_name, Key=key)
+        return json.loads(response["Body"].read())
+
+    async def export_target(self, target: dict, queue: asyncio.Queue):
+        """Runs the export for one target and puts each SBOM on the queue as it is read
+
+        Args:
+            target (dict): The target to export from
+            queue (asyncio.Queue): The queue the keys and parsed SBOMs are put on
+        """
+        name = target.get("roleArn", "default") + "/" + str(target.get("region"))
+        try:
+            session = await asyncio.to_thread(self.create_session, target)
+            client = await asyncio.to_thread(
+                session.client, "inspector2", endpoint_url=self.endpointUrl
+            )
+            report_id = await asyncio.to_thread(self.start_sbom_export, client, target)
+            self.logger.info(f"Report ID for {name}: {report_id}")
+            if not await self.check_for_export_complete(client, report_id):
+                self.logger.error(f"SBOM export failed for {name}")
+                return
+
+            self.logger.info(f"SBOM export successful for {name}")
+            bucket_name = target.get("bucketName", self.bucketName)
+            key_prefix = target.get("keyPrefix", self.keyPrefix)
+            key_prefix = key_prefix + f"CYCLONEDX_1_4_outputs_{report_id}/"
+            s3_client = await asyncio.to_thread(
+                session.client,
+                "s3",
+                config=Config(signature_version="s3v4"),
+                endpoint_url=self.endpointUrl,
+            )
+            keys = await asyncio.to_thread(
+                self.list_s3_keys, s3_client, bucket_name, key_prefix
+            )
+            for k in keys:
+                record = await asyncio.to_thread(
+                    self.read_s3_object, s3_client, bucket_name, k
+                )
+                await queue.put((k, record))
+        except Exception as e:
+            self.logger.error(f"SBOM export failed for {name}: {e}")
+        finally:
+            await queue.put(self._DONE)
 
     async def extract_records(self) -> Any:
-        """This performs the extraction of the records from the local SBOM copy
+        """This starts the exports for every target concurrently and performs the
+        extraction of the records as each SBOM becomes available
 
         Yields:
             dict: Yields the output
         """
-        paths = sorted(Path("tmp").rglob("*.json"))
-        for path in paths:
-            with open(path, "r") as f:
-                self.elements = []
-                str = f.read()
-                record = json.loads(str)
-                writer = CycloneDXWriter(record)
-                elements = writer.write_document()
+        queue = asyncio.Queue(maxsize=len(self.targets) * 2)
+        tasks = [
+            asyncio.create_task(self.export_target(target, queue))
+            for target in self.targets
+        ]
+        remaining = len(tasks)
+        try:
+            while remaining > 0:
+                item = await queue.get()
+                if item is self._DONE:
+                    remaining -= 1
+                    continue
+                key, record = item
+                elements = self.profiler.run(
+                    key,
+                    lambda: CycloneDXWriter(record, self.projection).write_document(),
+                )
                 for e in elements:
                     yield e
+        finally:
+            for task in tasks:
+                task.cancel()
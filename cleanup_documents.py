@@ -0,0 +1,82 @@
+import argparse
+import logging
+from pathlib import Path
+from neo4j import GraphDatabase
+from nodestream.project import Project
+
+# Document ids generated with uuid4 before document ids were derived from the BOM content.
+# nodestream lowercases key values by default, so these are stored as `document_<uuid>`.
+RANDOM_DOCUMENT_ID = (
+    "(?i)Document_[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}"
+)
+
+
+def cleanup_documents(
+    uri: str,
+    username: str,
+    password: str,
+    database: str = "neo4j",
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> int:
+    """Deletes the Document nodes, and their edges, which have randomly generated ids
+
+    These are duplicates left behind by every run before document ids were made
+    deterministic. Re-ingest the SBOMs first so each document exists under its new id.
+
+    Args:
+        uri (str): The bolt uri of the database
+        username (str): The database user
+        password (str): The database password
+        database (str, optional): The database name. Defaults to "neo4j".
+        batch_size (int, optional): The documents deleted per transaction. Defaults to 1000.
+        dry_run (bool, optional): Only count the duplicates. Defaults to False.
+
+    Returns:
+        int: The number of duplicate documents found
+    """
+    logger = logging.getLogger("cleanup_documents")
+    with GraphDatabase.driver(uri, auth=(username, password)) as driver:
+        with driver.session(database=database) as session:
+            count = session.run(
+                "MATCH (d:Document) WHERE d.id =~ $pattern RETURN count(d) AS count",
+                pattern=RANDOM_DOCUMENT_ID,
+            ).single()["count"]
+            logger.info(f"Found {count} duplicate Document nodes")
+            if count > 0 and not dry_run:
+                session.run(
+                    f"""
+                    MATCH (d:Document) WHERE d.id =~ $pattern
+                    CALL {{ WITH d DETACH DELETE d }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+                    """,
+                    pattern=RANDOM_DOCUMENT_ID,
+                ).consume()
+                logger.info(f"Deleted {count} duplicate Document nodes")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Delete the duplicate Document nodes created with random ids"
+    )
+    parser.add_argument("--project", default="nodestream.yaml")
+    parser.add_argument("--target", default="my-db")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    project = Project.read_from_file(Path(args.project))
+    config = project.get_target_by_name(args.target).resolved_connector_config
+    cleanup_documents(
+        config["uri"],
+        config["username"],
+        config["password"],
+        database=config.get("database_name", config.get("database", "neo4j")),
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,24 @@ from typing import Any, AsyncGenerator, Iterable
 from pathlib import Path
 from glob import glob
 import json
-from sbom_writer import CycloneDXWriter, SPDXWriter
+from sbom_writer import AttributeProjection, CycloneDXWriter, SPDXWriter
 import requests
+from sbom_profiler import SBOMProfiler
 
 
 class GithubSBOMExtractor(Extractor):
     bearer_token: str = None
 
-    def __init__(self, repos: list[str], bearer_token: str = None) -> None:
+    def __init__(
+        self,
+        repos: list[str],
+        bearer_token: str = None,
+        projection: dict = None,
+        profiling: dict = None,
+    ) -> None:
         self.repos = repos
+        self.projection = AttributeProjection(projection)
+        self.profiler = SBOMProfiler(profiling)
         if bearer_token is not None:
             self.bearer_token = bearer_token
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -38,7 +47,8 @@ class GithubSBOMExtractor(Extractor):
     async def extract_records(self):
         for repo in self.repos:
             record = self.fetch_sbom_from_github(repo)
-            writer = SPDXWriter(record)
-            elements = writer.write_document()
+            elements = self.profiler.run(
+                repo, lambda: SPDXWriter(record, self.projection).write_document()
+            )
             for e in elements:
                 yield e
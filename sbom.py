@@ -3,60 +3,76 @@ from nodestream.pipeline import Extractor
 from typing import Any, AsyncGenerator, Iterable
 from pathlib import Path
 from glob import glob
-import json
-from sbom_writer import CycloneDXWriter, SPDXWriter
-import flatdict
+from sbom_profiler import SBOMProfiler
+from sbom_watcher import SBOMWatcher
+from sbom_writer import AttributeProjection, SBOMConverter
 
 
 class SBOMExtractor(Extractor):
-    def __init__(self, paths: Iterable[Path]) -> None:
+    PATTERNS = SBOMConverter.PATTERNS
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        projection: dict = None,
+        sniffBytes: int = 65536,
+        profiling: dict = None,
+        watch: bool = False,
+        watchInterval: float = 1.0,
+        watchSettleSeconds: float = 2.0,
+        watchPolling: bool = False,
+    ) -> None:
         p = Path(paths)
         if p.is_dir():
-            self.paths = sorted(Path(paths).rglob("*.json"))
+            self.paths = sorted(
+                path for pattern in self.PATTERNS for path in p.rglob(pattern)
+            )
         elif p.is_file():
             self.paths = [p]
+        self.watcher = None
+        if watch:
+            self.watcher = SBOMWatcher(
+                p,
+                self.PATTERNS,
+                known=self.paths,
+                interval=watchInterval,
+                settle=watchSettleSeconds,
+                polling=watchPolling,
+            )
+        self.converter = SBOMConverter(AttributeProjection(projection), sniffBytes)
+        self.profiler = SBOMProfiler(profiling)
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    def __clean_dict(self, data: dict) -> dict:
-        d = data
-        try:
-            for key in list(data):
-                if isinstance(d[key], list) and len(d[key]) == 0:
-                    d.pop(key)
-                else:
-                    if key.startswith("__"):
-                        d.pop(key)
-            return dict(flatdict.FlatterDict(d, delimiter=".").items())
-        except Exception as e:
-            self.logger.error(e)
-            return d
+    def __extract_file(self, path: Path) -> list:
+        sniffed = self.converter.sniff(path)
+        if sniffed is None:
+            self.logger.info(f"Skipping {path} as it is not a CycloneDX or SPDX SBOM")
+            return []
+
+        return self.profiler.run(path, lambda: self.converter.convert(path, sniffed))
 
     async def extract_records(self):
         for path in self.paths:
-            elements = []
-            with open(path, "r") as f:
-                str = f.read()
-                record = json.loads(str)
-                if "bomFormat" in record and record["bomFormat"] == "CycloneDX":
-                    writer = CycloneDXWriter(record)
-                    elements = writer.write_document()
-                elif "SPDXID" in record:
-                    writer = SPDXWriter(record)
-                    elements = writer.write_document()
-                else:
-                    self.logger.info(
-                        f"The file at path {path} is not a valid CycloneDX SBOM"
-                    )
-                    print(f"The file at path {path} is not a valid CycloneDX SBOM")
             try:
-                for e in elements:
-                    if e is not None:
-                        self.logger.debug(e)
-                        if "attributes" in e:
-                            e["attributes"] = self.__clean_dict(e["attributes"])
-                        yield e
-                    else:
-                        print(e)
+                elements = self.__extract_file(path)
+            except Exception as e:
+                self.logger.error(f"Failed to ingest {path}: {e}")
+                continue
+            for e in elements:
+                if e is not None:
+                    self.logger.debug(e)
+                    yield e
+
+        if self.watcher is None:
+            return
+
+        async for path in self.watcher.changes():
+            self.logger.info(f"Ingesting changed SBOM {path}")
+            try:
+                elements = self.__extract_file(path)
             except Exception as e:
-                self.logger.error(e)
-                pass
+                self.logger.error(f"Failed to ingest {path}: {e}")
+                continue
+            for e in elements:
+                if e is not None:
+                    yield e
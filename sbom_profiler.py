@@ -0,0 +1,176 @@
+import itertools
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """A background thread which periodically samples the stack of another thread
+
+        Args:
+            thread_id (int): The id of the thread to sample
+            interval (float): Seconds between samples
+        """
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self.stopped.set()
+        self.join()
+        return self.samples
+
+
+class SBOMProfiler:
+    def __init__(self, config: dict | bool = None) -> None:
+        """Captures profiles of the SBOM files which are slow or memory hungry to transform
+
+        Profiling is off unless a config, or `true` for the default settings, is given.
+        When on, the stack of the transforming thread is sampled every `sampleInterval`
+        seconds and, if `memoryThreshold` is set, the allocations of each transform are
+        traced with tracemalloc. Profiles are only written for files whose transform
+        takes longer than `timeThreshold` seconds or whose peak traced memory exceeds
+        `memoryThreshold` MiB.
+
+        Tracing slows transforms down, more so the more `tracebackFrames` are kept per
+        allocation, so it defaults to 1 frame. The peak is measured from the start of
+        each transform, but includes any allocations made by other threads meanwhile.
+        The allocation snapshot is taken once the transform returns, so it shows where
+        the memory still held, such as the elements, was allocated.
+
+        Args:
+            config (dict | bool, optional): The `outputDir`, `timeThreshold`,
+                `memoryThreshold`, `sampleInterval` and `tracebackFrames` settings.
+                Defaults to None.
+        """
+        if config is None or isinstance(config, bool):
+            self.enabled = bool(config)
+            config = {}
+        elif isinstance(config, dict):
+            self.enabled = len(config) > 0
+        else:
+            raise TypeError(
+                f"The profiling settings must be a mapping or a boolean, not {config!r}"
+            )
+        self.output_dir = Path(config.get("outputDir", "profiles"))
+        self.time_threshold = config.get("timeThreshold", 10.0)
+        self.memory_threshold = config.get("memoryThreshold")
+        self.sample_interval = config.get("sampleInterval", 0.01)
+        self.traceback_frames = config.get("tracebackFrames", 1)
+        self.counter = itertools.count(1)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def run(self, source: str, transform: Callable[[], list]) -> list:
+        """Transforms one SBOM, profiling the transform
+
+        Args:
+            source (str): The path, or other name, of the SBOM being transformed
+            transform (Callable[[], list]): Transforms the SBOM into its elements
+
+        Returns:
+            list: The elements returned by the transform
+        """
+        if not self.enabled:
+            return transform()
+
+        tracing = self.memory_threshold is not None
+        started_tracing = tracing and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.traceback_frames)
+        if tracing:
+            tracemalloc.reset_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            elements = transform()
+        finally:
+            elapsed = time.perf_counter() - start
+            samples = sampler.stop()
+            peak, snapshot = None, None
+            if tracing:
+                peak = (tracemalloc.get_traced_memory()[1] - traced) / 2**20
+                if peak > self.memory_threshold:
+                    snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+
+        if elapsed > self.time_threshold or snapshot is not None:
+            stats = {
+                "elapsedSeconds": elapsed,
+                "peakMemoryMiB": peak,
+                "elementCounts": Counter(
+                    e["__type"] for e in elements if e is not None
+                ),
+            }
+            self.__write_profile(source, stats, samples, snapshot)
+        return elements
+
+    def __write_profile(
+        self,
+        source: str,
+        stats: dict,
+        samples: Counter,
+        snapshot: tracemalloc.Snapshot,
+    ):
+        """Writes the profile dumps for a slow or memory hungry SBOM file
+
+        Args:
+            source (str): The path, or other name, of the SBOM
+            stats (dict): The stats of the transform
+            samples (Counter): The sampled stacks
+            snapshot (tracemalloc.Snapshot): The allocation snapshot, or None
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = Path(str(source))
+        name = re.sub(r"[^\w.-]", "_", "_".join(path.parts[-2:]))
+        base = (
+            self.output_dir
+            / f"{name}.{time.strftime('%Y%m%dT%H%M%S')}.{next(self.counter):04d}"
+        )
+
+        with open(f"{base}.folded", "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        summary = {
+            "source": str(source),
+            **stats,
+            "samples": sum(samples.values()),
+            "sampleInterval": self.sample_interval,
+        }
+        if snapshot is not None:
+            snapshot.dump(f"{base}.tracemalloc")
+            summary["topAllocations"] = [
+                str(s) for s in snapshot.statistics("lineno")[:25]
+            ]
+
+        with open(f"{base}.json", "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+
+        self.logger.warning(
+            f"Profiled slow SBOM {source} ({stats['elapsedSeconds']:.2f}s, "
+            f"peak {stats['peakMemoryMiB']} MiB) to {base}.*"
+        )
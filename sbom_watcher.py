@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import AsyncGenerator, Iterable
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+
+class ChangeCollector:
+    def __init__(self, watcher: "SBOMWatcher") -> None:
+        """Collects the paths of the file system events raised on the observer thread
+
+        Args:
+            watcher (SBOMWatcher): The watcher to pass the changed paths to
+        """
+        self.watcher = watcher
+
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        if event.event_type in ("created", "modified", "closed"):
+            self.watcher.notify(Path(os.fsdecode(event.src_path)))
+        elif event.event_type == "moved":
+            self.watcher.notify(Path(os.fsdecode(event.dest_path)))
+
+
+class SBOMWatcher:
+    def __init__(
+        self,
+        root: Path,
+        patterns: Iterable[str],
+        known: Iterable[Path] = (),
+        interval: float = 1.0,
+        settle: float = 2.0,
+        polling: bool = False,
+    ) -> None:
+        """Watches a directory for SBOM files which are added or modified
+
+        File system change notifications are used when watchdog is installed, otherwise
+        the directory tree is polled by comparing file stats. A changed file is only
+        reported once its size and modification time have not changed for `settle`
+        seconds, so files which are still being written are not read early.
+
+        Args:
+            root (Path): The directory, or single file, to watch
+            patterns (Iterable[str]): The file name patterns to watch for
+            known (Iterable[Path], optional): The files which have already been read. Defaults to ().
+            interval (float, optional): Seconds between checks of the changed files. Defaults to 1.0.
+            settle (float, optional): Seconds a file must be unchanged before it is read. Defaults to 2.0.
+            polling (bool, optional): Poll even if watchdog is installed. Defaults to False.
+        """
+        root = Path(root)
+        self.only = root if root.is_file() else None
+        self.root = root.parent if root.is_file() else root
+        self.patterns = tuple(patterns)
+        self.interval = interval
+        self.settle = settle
+        self.polling = polling or Observer is None
+        self.known = {p: self.__stat(p) for p in map(Path, known)}
+        self.changed = set()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __stat(self, path: Path) -> tuple | None:
+        try:
+            s = path.stat()
+            return s.st_size, s.st_mtime_ns
+        except OSError:
+            return None
+
+    def __matches(self, path: Path) -> bool:
+        if self.only is not None:
+            return path == self.only
+        return any(fnmatch(path.name, p) for p in self.patterns)
+
+    def notify(self, path: Path):
+        """Marks a path as changed, this is safe to call from any thread
+
+        Args:
+            path (Path): The path which changed
+        """
+        if self.__matches(path):
+            with self.lock:
+                self.changed.add(path)
+
+    def __poll(self):
+        """Stats the watched tree and marks the files which are new or modified"""
+        if self.only is not None:
+            paths = [self.only]
+        else:
+            paths = []
+            stack = [self.root]
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                paths.append(Path(entry.path))
+                except OSError as e:
+                    self.logger.warning(e)
+        for path in paths:
+            if self.__matches(path) and self.known.get(path) != self.__stat(path):
+                self.notify(path)
+
+    def __settled(self) -> list[Path]:
+        """Gets the changed files which have stopped changing
+
+        Returns:
+            list[Path]: The settled files, in the order they changed
+        """
+        with self.lock:
+            changed, self.changed = self.changed, set()
+
+        now = time.monotonic()
+        for path in changed:
+            self.pending.setdefault(path, (None, now))
+
+        settled = []
+        for path, (last, since) in list(self.pending.items()):
+            current = self.__stat(path)
+            if current is None:
+                del self.pending[path]
+            elif current != last:
+                self.pending[path] = (current, now)
+            elif now - since >= self.settle:
+                del self.pending[path]
+                if self.known.get(path) != current:
+                    self.known[path] = current
+                    settled.append(path)
+        return settled
+
+    async def changes(self) -> AsyncGenerator[Path, None]:
+        """Yields the SBOM files as they are added or modified, forever
+
+        Yields:
+            Path: The path of the settled file
+        """
+        observer = None
+        if not self.polling:
+            observer = Observer()
+            observer.schedule(ChangeCollector(self), str(self.root), recursive=True)
+            observer.start()
+            self.logger.info(f"Watching {self.root} for file system changes")
+        elif Observer is None:
+            self.logger.warning(
+                f"watchdog is not installed, falling back to polling {self.root} "
+                f"every {self.interval}s for changes"
+            )
+        else:
+            self.logger.info(f"Polling {self.root} every {self.interval}s for changes")
+
+        try:
+            # The known files were stat'ed before they were read, and the observer has
+            # only just started, so catch up on the files changed in between
+            await asyncio.to_thread(self.__poll)
+            while True:
+                for path in await asyncio.to_thread(self.__settled):
+                    yield path
+                await asyncio.sleep(self.interval)
+                if observer is None:
+                    await asyncio.to_thread(self.__poll)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
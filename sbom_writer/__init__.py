@@ -1,4 +1,19 @@
+from .attribute_projection import AttributeProjection
 from .cyclonedx_writer import CycloneDXWriter
+from .cyclonedx_xml_reader import CycloneDXXMLReader
+from .sbom_converter import SBOMConverter
+from .sbom_sniffer import SBOMEncoding, SBOMFormat, SBOMSniffer
+from .spdx_tag_value_reader import SPDXTagValueReader
 from .spdx_writer import SPDXWriter
 
-__all__ = ("CycloneDXWriter", "SPDXWriter")
+__all__ = (
+    "AttributeProjection",
+    "CycloneDXWriter",
+    "CycloneDXXMLReader",
+    "SBOMConverter",
+    "SBOMEncoding",
+    "SBOMFormat",
+    "SBOMSniffer",
+    "SPDXTagValueReader",
+    "SPDXWriter",
+)
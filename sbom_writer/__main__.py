@@ -0,0 +1,150 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from glob import glob, has_magic
+from multiprocessing import Pool
+from pathlib import Path
+from .attribute_projection import AttributeProjection
+from .sbom_converter import SBOMConverter
+
+converter: SBOMConverter = None
+
+
+def init_worker(projection: dict, sniff_bytes: int):
+    """Creates the converter of a worker process"""
+    global converter
+    converter = SBOMConverter(AttributeProjection(projection), sniff_bytes)
+
+
+def convert_file(path: str) -> tuple[str, int, bytes, str]:
+    """Converts a file to NDJSON in a worker process
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        tuple[str, int, bytes, str]: The path, element count, NDJSON and error, if any
+    """
+    try:
+        elements = [e for e in converter.convert(Path(path)) if e is not None]
+        lines = "".join(json.dumps(e, default=str) + "\n" for e in elements)
+        return path, len(elements), lines.encode(), None
+    except Exception as e:
+        return path, 0, b"", f"{type(e).__name__}: {e}"
+
+
+def find_files(inputs: list[str]) -> tuple[list[str], list[str]]:
+    """Expands the directories and globs to convert into the files to convert
+
+    Args:
+        inputs (list[str]): The directories, globs and files
+
+    Returns:
+        tuple[list[str], list[str]]: The files, without duplicates, and the inputs
+            which matched no files
+    """
+    files, unmatched = {}, []
+    for i in inputs:
+        p = Path(i)
+        if p.is_dir():
+            matched = [
+                str(f)
+                for pattern in SBOMConverter.PATTERNS
+                for f in sorted(p.rglob(pattern))
+            ]
+        elif has_magic(i):
+            matched = sorted(glob(i, recursive=True))
+        else:
+            matched = [i]
+        matched = [f for f in matched if os.path.isfile(f)]
+        if not matched:
+            unmatched.append(i)
+        files.update((f, None) for f in matched)
+    return list(files), unmatched
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m sbom_writer",
+        description="Convert SBOMs to newline delimited JSON elements",
+    )
+    parser.add_argument("inputs", nargs="+", help="SBOM files, directories or globs")
+    parser.add_argument(
+        "-o", "--output", help="Directory to write shard files to, instead of stdout"
+    )
+    parser.add_argument("-s", "--shards", type=int, default=1)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "-p", "--projection", help="JSON file of attribute projection rules"
+    )
+    parser.add_argument("--sniff-bytes", type=int, default=65536)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr
+    )
+    logger = logging.getLogger("sbom_writer")
+    projection = None
+    if args.projection:
+        with open(args.projection, "r") as f:
+            projection = json.load(f)
+
+    files, unmatched = find_files(args.inputs)
+    for i in unmatched:
+        logger.error(f"No files found for {i}")
+    if not files:
+        print("No files to convert", file=sys.stderr)
+        return 1
+    if args.output:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        outputs = [
+            open(Path(args.output) / f"part-{i:05d}.ndjson", "wb", buffering=1 << 20)
+            for i in range(args.shards)
+        ]
+    else:
+        outputs = [sys.stdout.buffer]
+
+    start = time.perf_counter()
+    elements, size, failed = 0, 0, 0
+    try:
+        with Pool(
+            args.jobs, initializer=init_worker, initargs=(projection, args.sniff_bytes)
+        ) as pool:
+            results = pool.imap_unordered(
+                convert_file, files, chunksize=max(1, len(files) // (args.jobs * 8))
+            )
+            for i, (path, count, lines, error) in enumerate(results):
+                if error is not None:
+                    failed += 1
+                    logger.error(f"Failed to convert {path}: {error}")
+                    continue
+                outputs[i % len(outputs)].write(lines)
+                elements += count
+                size += len(lines)
+    finally:
+        for output in outputs:
+            output.flush()
+            if output is not sys.stdout.buffer:
+                output.close()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"Converted {len(files) - failed} of {len(files)} files into {elements} elements "
+        f"({size / 2**20:.1f} MiB) in {elapsed:.2f}s: "
+        f"{len(files) / elapsed:.1f} files/s, {elements / elapsed:.0f} elements/s, "
+        f"{size / 2**20 / elapsed:.1f} MiB/s",
+        file=sys.stderr,
+    )
+    return 1 if failed > 0 or unmatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
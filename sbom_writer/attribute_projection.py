@@ -0,0 +1,67 @@
+import re
+from fnmatch import translate
+from typing import Iterable
+
+
+class KeyMatcher:
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Compiles a list of attribute keys, which may contain glob patterns, into a matcher
+
+        Args:
+            keys (Iterable[str]): The keys or glob patterns to match
+        """
+        keys = list(keys or [])
+        self.names = frozenset(k for k in keys if not any(c in k for c in "*?["))
+        patterns = [translate(k) for k in keys if k not in self.names]
+        self.pattern = re.compile("|".join(patterns)) if patterns else None
+
+    def __call__(self, key: str) -> bool:
+        return key in self.names or (
+            self.pattern is not None and self.pattern.match(key) is not None
+        )
+
+
+class AttributeProjection:
+    DEFAULT_RULE = "*"
+
+    def __init__(self, rules: dict = None) -> None:
+        """Compiles the per node type include and exclude rules for element attributes
+
+        Rules are keyed by node label, e.g. `Component`, with `*` as the rule for any label
+        that does not have its own. Each rule may have an `include` and an `exclude` list of
+        attribute keys or glob patterns. When `include` is set only matching keys are kept,
+        and matching `exclude` keys are always dropped.
+
+        Args:
+            rules (dict, optional): The projection rules by node label. Defaults to None.
+        """
+        self.rules = {
+            label: (
+                KeyMatcher(rule["include"]) if rule.get("include") else None,
+                KeyMatcher(rule.get("exclude")),
+            )
+            for label, rule in (rules or {}).items()
+        }
+
+    def project(self, label: str, source: dict, required: Iterable[str] = ()) -> dict:
+        """Copies the keys of the source which pass the rules for the label
+
+        Args:
+            label (str): The node label the attributes are for
+            source (dict): The source to copy the attributes from
+            required (Iterable[str], optional): Keys the writer needs, which are always kept
+
+        Returns:
+            dict: The projected attributes
+        """
+        rule = self.rules.get(label, self.rules.get(self.DEFAULT_RULE))
+        if rule is None:
+            return {**source}
+
+        include, exclude = rule
+        return {
+            k: v
+            for k, v in source.items()
+            if k in required
+            or ((include is None or include(k)) and not exclude(k))
+        }
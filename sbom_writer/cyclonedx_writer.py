@@ -1,9 +1,10 @@
-import uuid
 from typing import Iterable
 from .sbom_writer import SBOMWriter
 
 
 class CycloneDXWriter(SBOMWriter):
+    __DOCUMENT_REQUIRED = ("component", "components")
+
     def write_document(self) -> Iterable:
         """Writes the CycloneDX document
 
@@ -40,16 +41,24 @@ class CycloneDXWriter(SBOMWriter):
         Returns:
             dict: The document
         """
-        if "serialNumber" in bom:
-            document_id = f"{self.NodeLabels.DOCUMENT.value}_{bom['serialNumber']}"
-        else:
-            document_id = f"{self.NodeLabels.DOCUMENT.value}_{uuid.uuid4()}"
+        document_id = self._document_id(bom.get("serialNumber"))
 
         if "metadata" in bom and "component":
-            attr = {**bom, **bom["metadata"]}
-            del attr["metadata"]
+            attr = {
+                **self._attributes(
+                    self.NodeLabels.DOCUMENT, bom, required=self.__DOCUMENT_REQUIRED
+                ),
+                **self._attributes(
+                    self.NodeLabels.DOCUMENT,
+                    bom["metadata"],
+                    required=self.__DOCUMENT_REQUIRED,
+                ),
+            }
+            attr.pop("metadata", None)
         else:
-            attr = {**bom}
+            attr = self._attributes(
+                self.NodeLabels.DOCUMENT, bom, required=self.__DOCUMENT_REQUIRED
+            )
 
         document = {
             "attributes": attr,
@@ -91,14 +100,18 @@ class CycloneDXWriter(SBOMWriter):
                 if "license" in lic:
                     if "id" in lic["license"]:
                         license = {
-                            "attributes": {**lic["license"]},
+                            "attributes": self._attributes(
+                                self.NodeLabels.LICENSE, lic["license"], ("id",)
+                            ),
                             "__type": self.NodeLabels.LICENSE.value,
                             "__license_id": f"{self.NodeLabels.LICENSE.value}_{str(lic['license']['id']).lower()}",
                         }
                         license["attributes"]["name"] = license["attributes"].pop("id")
                     elif "name" in lic["license"]:
                         license = {
-                            "attributes": {**lic["license"]},
+                            "attributes": self._attributes(
+                                self.NodeLabels.LICENSE, lic["license"]
+                            ),
                             "__type": self.NodeLabels.LICENSE.value,
                             "__license_id": f"{self.NodeLabels.LICENSE.value}_{str(lic['license']['name']).lower()}",
                         }
@@ -109,11 +122,21 @@ class CycloneDXWriter(SBOMWriter):
                     license["licensed_by"] = [
                         {
                             "__toId": toId,
+                            "field": lic["license"].get("acknowledgement", "licenses"),
+                            "expression": str(
+                                lic["license"].get("id", lic["license"].get("name"))
+                            ),
                         }
                     ]
                     self.elements.append(license)
+                elif "expression" in lic:
+                    self._write_license_expression(
+                        lic["expression"], toId, lic.get("acknowledgement", "licenses")
+                    )
                 else:
-                    self.logger.info("Skipping License nodes due to no 'license' field")
+                    self.logger.info(
+                        "Skipping License nodes due to no 'license' or 'expression' field"
+                    )
         except Exception as e:
             self.logger.error("Error extracting License nodes", e)
 
@@ -127,7 +150,9 @@ class CycloneDXWriter(SBOMWriter):
         for c in components:
             if "type" and "name" in c:
                 component = {
-                    "attributes": {**c},
+                    "attributes": self._attributes(
+                        self.NodeLabels.COMPONENT, c, required=("bom-ref",)
+                    ),
                     "__type": self.NodeLabels.COMPONENT.value,
                     "__component_id": f"{self.NodeLabels.COMPONENT.value}_{c['type']}_{c['name']}",
                 }
@@ -139,13 +164,14 @@ class CycloneDXWriter(SBOMWriter):
 
             if "licenses" in c:
                 self.__write_license(c["licenses"], component["__component_id"])
-                del c["licenses"]
 
             if "externalReferences" in c:
                 self.elements.extend(
                     [
                         {
-                            "attributes": {**r},
+                            "attributes": self._attributes(
+                                self.NodeLabels.REFERENCE, r
+                            ),
                             "__type": self.NodeLabels.REFERENCE.value,
                             "__reference_id": f"{self.NodeLabels.REFERENCE.value}_{r['url']}",
                         }
@@ -180,7 +206,7 @@ class CycloneDXWriter(SBOMWriter):
         for d in dependencies:
             if "dependsOn" in d:
                 dependency = {
-                    "attributes": {**d},
+                    "attributes": self._attributes(self.NodeLabels.COMPONENT, d),
                     "__type": self.NodeLabels.COMPONENT.value,
                     "__component_id": self.__get_component_id_from_bomref(d["ref"]),
                 }
@@ -206,7 +232,7 @@ class CycloneDXWriter(SBOMWriter):
         """
         for v in vulnerabilities:
             vul = {
-                "attributes": {**v},
+                "attributes": self._attributes(self.NodeLabels.VULNERABILITY, v),
                 "__type": self.NodeLabels.VULNERABILITY.value,
                 "__vulnerability_id": f"{self.NodeLabels.VULNERABILITY.value}_{v['id']}",
             }
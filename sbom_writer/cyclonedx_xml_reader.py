@@ -0,0 +1,163 @@
+import logging
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+
+class CycloneDXXMLReader:
+    # The container elements which are arrays in the JSON representation
+    LISTS = frozenset(
+        (
+            "components",
+            "services",
+            "licenses",
+            "hashes",
+            "externalReferences",
+            "properties",
+            "authors",
+            "dependencies",
+            "vulnerabilities",
+            "references",
+            "ratings",
+            "cwes",
+            "advisories",
+            "affects",
+            "versions",
+            "endpoints",
+            "data",
+            "patches",
+            "commits",
+            "identity",
+            "occurrences",
+            "callstack",
+            "frames",
+        )
+    )
+    INTEGER_ATTRIBUTES = frozenset(("version",))
+    INTEGER_ELEMENTS = frozenset(("cwe",))
+    NAMESPACE = re.compile(r"^\{http://cyclonedx\.org/schema/bom/([\d.]+)\}")
+
+    def __init__(self, path: Path) -> None:
+        """Reads a CycloneDX XML document into the same shape as its JSON representation
+
+        The document is parsed incrementally and each top level component, dependency
+        and vulnerability is discarded from the XML tree as soon as it is converted, so
+        the XML tree is never held in memory in full.
+
+        Args:
+            path (Path): The path of the XML document
+        """
+        self.path = path
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def read(self) -> dict:
+        """Reads the document
+
+        Returns:
+            dict: The BOM in the CycloneDX JSON shape
+        """
+        bom = {"bomFormat": "CycloneDX"}
+        stack = []
+        for event, elem in ET.iterparse(self.path, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if len(stack) == 1:
+                    match = self.NAMESPACE.match(elem.tag)
+                    if match:
+                        bom["specVersion"] = match.group(1)
+                    bom.update(self.__attributes(elem))
+                continue
+
+            stack.pop()
+            if len(stack) == 1:
+                name = self.__name(elem)
+                if name in self.LISTS:
+                    bom.setdefault(name, [])
+                else:
+                    bom[name] = self.__convert(elem)
+                stack[0].remove(elem)
+            elif len(stack) == 2 and self.__name(stack[1]) in self.LISTS:
+                section = self.__name(stack[1])
+                bom.setdefault(section, []).append(self.__convert_item(section, elem))
+                stack[1].remove(elem)
+        return bom
+
+    def __name(self, elem: ET.Element) -> str:
+        return elem.tag.rsplit("}", 1)[-1]
+
+    def __text(self, elem: ET.Element) -> str:
+        return (elem.text or "").strip()
+
+    def __attributes(self, elem: ET.Element) -> dict:
+        attributes = {}
+        for k, v in elem.attrib.items():
+            if k.startswith("{http://www.w3.org/"):
+                continue
+            if k in self.INTEGER_ATTRIBUTES and v.isdigit():
+                v = int(v)
+            attributes[k.rsplit("}", 1)[-1]] = v
+        return attributes
+
+    def __convert(self, elem: ET.Element):
+        """Converts an element into its JSON value
+
+        Args:
+            elem (ET.Element): The element to convert
+
+        Returns:
+            Any: The text of leaf elements, otherwise a dict of the attributes and children
+        """
+        if len(elem) == 0 and not elem.attrib:
+            text = self.__text(elem)
+            if self.__name(elem) in self.INTEGER_ELEMENTS and text.isdigit():
+                return int(text)
+            return text
+
+        value = self.__attributes(elem)
+        if len(elem) == 0 and self.__text(elem):
+            value["content"] = self.__text(elem)
+        for child in elem:
+            name = self.__name(child)
+            if name in self.LISTS or self.__is_legacy_tools(child):
+                value[name] = [self.__convert_item(name, c) for c in child]
+            else:
+                value[name] = self.__convert(child)
+        return value
+
+    def __is_legacy_tools(self, elem: ET.Element) -> bool:
+        """Checks if an element is a list of tools, which were `tool` elements up to
+        CycloneDX 1.4 and are an object of `components` and `services` since 1.5
+
+        Args:
+            elem (ET.Element): The element to check
+
+        Returns:
+            bool: True if the element is a list of legacy tools
+        """
+        return self.__name(elem) == "tools" and all(
+            self.__name(c) == "tool" for c in elem
+        )
+
+    def __convert_item(self, container: str, elem: ET.Element):
+        """Converts an item of a list container, for the items which differ from the
+        generic conversion in the JSON representation
+
+        Args:
+            container (str): The name of the list container
+            elem (ET.Element): The item to convert
+
+        Returns:
+            Any: The JSON value of the item
+        """
+        if container == "licenses":
+            if self.__name(elem) == "expression":
+                return {"expression": self.__text(elem)}
+            return {"license": self.__convert(elem)}
+        elif container == "properties":
+            return {"name": elem.get("name"), "value": self.__text(elem)}
+        elif container == "dependencies":
+            dependency = {"ref": elem.get("ref")}
+            if len(elem) > 0:
+                dependency["dependsOn"] = [d.get("ref") for d in elem]
+            return dependency
+        return self.__convert(elem)
@@ -0,0 +1,121 @@
+import logging
+import re
+from functools import lru_cache
+
+TOKENS = re.compile(r"\(|\)|[^\s()]+")
+OPERATORS = ("OR", "AND")
+
+logger = logging.getLogger(__name__)
+
+
+class LicenseExpressionError(ValueError):
+    pass
+
+
+class LicenseExpressionParser:
+    def __init__(self, expression: str) -> None:
+        """A recursive descent parser for SPDX license expressions, where OR binds
+        looser than AND, which binds looser than WITH
+
+        Args:
+            expression (str): The license expression to parse
+        """
+        self.tokens = TOKENS.findall(expression)
+        self.position = 0
+
+    def parse(self) -> tuple:
+        """Parses the expression into a tree of `(operator, children)` tuples for compound
+        expressions and `(None, license, exception)` tuples for licenses
+
+        Returns:
+            tuple: The root of the expression tree
+        """
+        tree = self.__parse_operator(0)
+        if self.position != len(self.tokens):
+            raise LicenseExpressionError(f"Unexpected {self.tokens[self.position]}")
+        return tree
+
+    def __peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def __next(self) -> str:
+        token = self.__peek()
+        if token is None:
+            raise LicenseExpressionError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def __parse_operator(self, precedence: int) -> tuple:
+        if precedence == len(OPERATORS):
+            return self.__parse_license()
+
+        operator = OPERATORS[precedence]
+        children = [self.__parse_operator(precedence + 1)]
+        while (self.__peek() or "").upper() == operator:
+            self.__next()
+            children.append(self.__parse_operator(precedence + 1))
+        return children[0] if len(children) == 1 else (operator, children)
+
+    def __parse_license(self) -> tuple:
+        token = self.__next()
+        if token == "(":
+            tree = self.__parse_operator(0)
+            if self.__next() != ")":
+                raise LicenseExpressionError("Expected )")
+            return tree
+        if token == ")" or token.upper() in OPERATORS + ("WITH",):
+            raise LicenseExpressionError(f"Unexpected {token}")
+
+        exception = None
+        if (self.__peek() or "").upper() == "WITH":
+            self.__next()
+            exception = self.__next()
+        return (None, token, exception)
+
+
+def flatten(tree: tuple, operator: str = None):
+    """Yields the licenses of an expression tree, with the operator which joins each
+    license to its siblings
+
+    Args:
+        tree (tuple): The expression tree
+        operator (str, optional): The operator of the parent. Defaults to None.
+
+    Yields:
+        tuple[str, str, str]: The license, operator and exception
+    """
+    if tree[0] is None:
+        yield tree[1], operator, tree[2]
+    else:
+        for child in tree[1]:
+            yield from flatten(child, tree[0])
+
+
+@lru_cache(maxsize=4096)
+def parse_license_expression(expression: str) -> tuple:
+    """Splits a license expression into its individual licenses
+
+    For example `(MIT OR Apache-2.0) AND BSD-3-Clause` gives `MIT` and `Apache-2.0` with
+    the `OR` operator and `BSD-3-Clause` with the `AND` operator. Expressions which do
+    not parse are returned whole as a single license. Results are cached, as the same
+    few expressions repeat across most packages.
+
+    Args:
+        expression (str): The license expression
+
+    Returns:
+        tuple[tuple[str, str, str], ...]: The distinct licenses, each with its operator
+            and exception, which are None when there is none
+    """
+    try:
+        licenses = {}
+        for license, operator, exception in flatten(
+            LicenseExpressionParser(expression).parse()
+        ):
+            licenses.setdefault(license.lower(), (license, operator, exception))
+        return tuple(licenses.values())
+    except LicenseExpressionError as e:
+        logger.info(f"Could not parse license expression {expression}: {e}")
+        return ((expression.strip(), None, None),)
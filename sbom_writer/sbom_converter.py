@@ -0,0 +1,150 @@
+import json
+import logging
+from pathlib import Path
+from .attribute_projection import AttributeProjection
+from .cyclonedx_writer import CycloneDXWriter
+from .cyclonedx_xml_reader import CycloneDXXMLReader
+from .sbom_sniffer import SBOMEncoding, SBOMFormat, SBOMSniffer
+from .spdx_tag_value_reader import SPDXTagValueReader
+from .spdx_writer import SPDXWriter
+
+
+class SBOMConverter:
+    PATTERNS = ("*.json", "*.xml", "*.spdx")
+
+    def __init__(
+        self, projection: AttributeProjection = None, sniff_bytes: int = 65536
+    ) -> None:
+        """Converts SBOM files into the flattened elements of the graph
+
+        Args:
+            projection (AttributeProjection, optional): The attribute projection rules. Defaults to None.
+            sniff_bytes (int, optional): The number of bytes read to sniff a file. Defaults to 65536.
+        """
+        self.projection = projection or AttributeProjection()
+        self.sniffer = SBOMSniffer(sniff_bytes)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def sniff(self, path: Path) -> tuple[SBOMFormat, str, SBOMEncoding] | None:
+        """Classifies a file, see `SBOMSniffer.sniff`"""
+        return self.sniffer.sniff(path)
+
+    def read_record(self, path: Path, encoding: SBOMEncoding) -> dict:
+        """Reads an SBOM file into the shape of its JSON representation
+
+        Args:
+            path (Path): The path of the file
+            encoding (SBOMEncoding): The encoding of the file
+
+        Returns:
+            dict: The BOM
+        """
+        if encoding == SBOMEncoding.XML:
+            return CycloneDXXMLReader(path).read()
+        elif encoding == SBOMEncoding.TAG_VALUE:
+            return SPDXTagValueReader(path).read()
+        with open(path, "r") as f:
+            str = f.read()
+            return json.loads(str)
+
+    def write_elements(
+        self, path: Path, format: SBOMFormat, version: str, encoding: SBOMEncoding
+    ) -> list:
+        """Reads an SBOM file and writes its elements
+
+        Args:
+            path (Path): The path of the file
+            format (SBOMFormat): The format of the file
+            version (str): The spec version of the file
+            encoding (SBOMEncoding): The encoding of the file
+
+        Returns:
+            list: The elements, which is empty if the file is not a valid SBOM
+        """
+        record = self.read_record(path, encoding)
+        if format == SBOMFormat.CYCLONEDX and record.get("bomFormat") == "CycloneDX":
+            self.logger.debug(f"Reading {path} as CycloneDX {version} {encoding.name}")
+            writer = CycloneDXWriter(record, self.projection)
+            return writer.write_document()
+        elif format == SBOMFormat.SPDX and "SPDXID" in record:
+            self.logger.debug(f"Reading {path} as SPDX {version} {encoding.name}")
+            writer = SPDXWriter(record, self.projection)
+            return writer.write_document()
+        else:
+            self.logger.info(f"The file at path {path} is not a valid {format.value} SBOM")
+            return []
+
+    def __flatten(self, value, prefix: str, flattened: dict):
+        """Flattens nested dicts and lists into dotted keys, with list items keyed by
+        their index, keeping empty nested dicts and lists as values
+
+        Args:
+            value (Any): The value to flatten
+            prefix (str): The dotted key of the value
+            flattened (dict): The dict the flattened keys are added to
+        """
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, (list, tuple)):
+            items = enumerate(value)
+        else:
+            flattened[prefix] = value
+            return
+
+        if len(value) == 0 and prefix:
+            flattened[prefix] = value
+            return
+        for k, v in items:
+            self.__flatten(v, f"{prefix}.{k}" if prefix else str(k), flattened)
+
+    def clean_attributes(self, data: dict) -> dict:
+        """Drops the empty lists and internal keys of the attributes and flattens them
+        into dotted keys
+
+        Args:
+            data (dict): The attributes to clean
+
+        Returns:
+            dict: The flattened attributes
+        """
+        d = data
+        try:
+            for key in list(data):
+                if isinstance(d[key], list) and len(d[key]) == 0:
+                    d.pop(key)
+                else:
+                    if key.startswith("__"):
+                        d.pop(key)
+            flattened = {}
+            self.__flatten(d, "", flattened)
+            return flattened
+        except Exception as e:
+            self.logger.error(e)
+            return d
+
+    def convert(
+        self, path: Path, sniffed: tuple[SBOMFormat, str, SBOMEncoding] = None
+    ) -> list:
+        """Converts an SBOM file into its elements, with flattened attributes
+
+        Args:
+            path (Path): The path of the file
+            sniffed (tuple[SBOMFormat, str, SBOMEncoding], optional): The result of
+                sniffing the file. Defaults to None, in which case the file is sniffed.
+
+        Returns:
+            list: The elements, which is empty if the file is not an SBOM
+        """
+        sniffed = sniffed or self.sniff(path)
+        if sniffed is None:
+            self.logger.info(f"Skipping {path} as it is not a CycloneDX or SPDX SBOM")
+            return []
+
+        elements = self.write_elements(path, *sniffed)
+        try:
+            for e in elements:
+                if e is not None and "attributes" in e:
+                    e["attributes"] = self.clean_attributes(e["attributes"])
+        except Exception as e:
+            self.logger.error(e)
+        return elements
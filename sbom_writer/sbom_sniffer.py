@@ -0,0 +1,111 @@
+import logging
+import re
+from enum import Enum
+from pathlib import Path
+
+
+class SBOMFormat(Enum):
+    CYCLONEDX = "CycloneDX"
+    SPDX = "SPDX"
+
+
+class SBOMEncoding(Enum):
+    JSON = "json"
+    XML = "xml"
+    TAG_VALUE = "spdx"
+
+
+class SBOMSniffer:
+    FILENAME_HINT = re.compile(
+        r"_(CYCLONEDX|SPDX)_(\d+(?:_\d+)*)\.(json|xml|spdx)$", re.IGNORECASE
+    )
+    CYCLONEDX_FORMAT = re.compile(rb'"bomFormat"\s*:\s*"CycloneDX"')
+    CYCLONEDX_VERSION = re.compile(rb'"specVersion"\s*:\s*"([\d.]+)"')
+    SPDX_VERSION = re.compile(rb'"spdxVersion"\s*:\s*"SPDX-([\d.]+)"')
+    SPDX_ID = re.compile(rb'"SPDXID"\s*:\s*"SPDXRef-DOCUMENT"')
+    CYCLONEDX_XML_NAMESPACE = re.compile(
+        rb'<(?:\w+:)?bom\b[^>]*xmlns(?::\w+)?\s*=\s*"http://cyclonedx\.org/schema/bom/([\d.]+)"'
+    )
+    SPDX_TAG_VALUE_VERSION = re.compile(rb"^SPDXVersion:\s*SPDX-([\d.]+)", re.MULTILINE)
+
+    def __init__(self, prefix_size: int = 65536) -> None:
+        """Classifies SBOM files from their name or a bounded prefix of their content
+
+        Args:
+            prefix_size (int, optional): The number of bytes read to sniff a file. Defaults to 65536.
+        """
+        self.prefix_size = prefix_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def sniff_filename(self, path: Path) -> tuple[SBOMFormat, str, SBOMEncoding] | None:
+        """Gets the format hint from file names such as `*_CYCLONEDX_1_4.json`
+
+        Args:
+            path (Path): The path of the file
+
+        Returns:
+            tuple[SBOMFormat, str, SBOMEncoding] | None: The format, version and encoding,
+                or None if there is no hint
+        """
+        match = self.FILENAME_HINT.search(Path(path).name)
+        if match is None:
+            return None
+        name = match.group(1).upper()
+        format = SBOMFormat.CYCLONEDX if name == "CYCLONEDX" else SBOMFormat.SPDX
+        encoding = SBOMEncoding(match.group(3).lower())
+        if format == SBOMFormat.CYCLONEDX and encoding == SBOMEncoding.TAG_VALUE:
+            return None
+        return format, match.group(2).replace("_", "."), encoding
+
+    def sniff_prefix(self, prefix: bytes) -> tuple[SBOMFormat, str, SBOMEncoding] | None:
+        """Classifies the start of a JSON, XML or SPDX tag-value document
+
+        Args:
+            prefix (bytes): The first bytes of the file
+
+        Returns:
+            tuple[SBOMFormat, str, SBOMEncoding] | None: The format, version and encoding,
+                or None if it is not an SBOM
+        """
+        stripped = prefix.lstrip(b"\xef\xbb\xbf \t\r\n")
+        if stripped.startswith(b"<"):
+            version = self.CYCLONEDX_XML_NAMESPACE.search(prefix)
+            if version:
+                return SBOMFormat.CYCLONEDX, version.group(1).decode(), SBOMEncoding.XML
+            return None
+
+        if not stripped.startswith(b"{"):
+            version = self.SPDX_TAG_VALUE_VERSION.search(prefix)
+            if version:
+                return SBOMFormat.SPDX, version.group(1).decode(), SBOMEncoding.TAG_VALUE
+            return None
+
+        if self.CYCLONEDX_FORMAT.search(prefix):
+            version = self.CYCLONEDX_VERSION.search(prefix)
+            version = version.group(1).decode() if version else None
+            return SBOMFormat.CYCLONEDX, version, SBOMEncoding.JSON
+
+        version = self.SPDX_VERSION.search(prefix)
+        if version:
+            return SBOMFormat.SPDX, version.group(1).decode(), SBOMEncoding.JSON
+        if self.SPDX_ID.search(prefix):
+            return SBOMFormat.SPDX, None, SBOMEncoding.JSON
+
+        return None
+
+    def sniff(self, path: Path) -> tuple[SBOMFormat, str, SBOMEncoding] | None:
+        """Classifies a file, using the file name hint if there is one
+
+        Args:
+            path (Path): The path of the file
+
+        Returns:
+            tuple[SBOMFormat, str, SBOMEncoding] | None: The format, version and encoding,
+                or None if it is not an SBOM
+        """
+        hint = self.sniff_filename(path)
+        if hint is not None:
+            return hint
+
+        with open(path, "rb") as f:
+            return self.sniff_prefix(f.read(self.prefix_size))
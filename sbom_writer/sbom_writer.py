@@ -1,6 +1,11 @@
 from enum import Enum
 from abc import ABC, abstractmethod
+import hashlib
+import json
 import logging
+from typing import Iterable
+from .attribute_projection import AttributeProjection
+from .license_expression import parse_license_expression
 
 
 class SBOMWriter(ABC):
@@ -21,11 +26,74 @@ class SBOMWriter(ABC):
         AFFECTS = "AFFECTS"
         LICENSED_BY = "LICENSED_BY"
 
-    def __init__(self, bom: dict) -> None:
+    def __init__(self, bom: dict, projection: AttributeProjection = None) -> None:
         self.bom = bom
+        self.projection = projection or AttributeProjection()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.elements = []
 
+    def _attributes(
+        self, label: NodeLabels, source: dict, required: Iterable[str] = ()
+    ) -> dict:
+        """Copies the attributes for a node from the source, applying the projection rules
+
+        Args:
+            label (NodeLabels): The label of the node the attributes are for
+            source (dict): The source to copy the attributes from
+            required (Iterable[str], optional): Keys the writer needs, which are always kept
+
+        Returns:
+            dict: The attributes of the node
+        """
+        return self.projection.project(label.value, source, required)
+
+    def _document_id(self, stable_id: str = None) -> str:
+        """Gets the id of the document node, so re-ingesting the same BOM upserts the same node
+
+        Args:
+            stable_id (str, optional): A stable identifier of the BOM, such as its serial
+                number. Defaults to None, in which case a canonical hash of the BOM is used.
+
+        Returns:
+            str: The document id
+        """
+        if stable_id is None:
+            canonical = json.dumps(
+                self.bom, sort_keys=True, separators=(",", ":"), default=str
+            )
+            stable_id = f"sha256:{hashlib.sha256(canonical.encode()).hexdigest()}"
+        return f"{self.NodeLabels.DOCUMENT.value}_{stable_id}"
+
+    def _write_license_expression(self, expression: str, toId: str, field: str):
+        """Writes a License node for each license of a license expression, with the
+        operator joining it to the others and any exception kept on the edge
+
+        The edge is keyed on the field and the expression, so a license which appears in
+        several fields of the same package, such as its declared and concluded licenses,
+        gets an edge for each.
+
+        Args:
+            expression (str): The license expression to write
+            toId (str): The id of the node to connect to
+            field (str): The field of the node the expression was read from
+        """
+        for name, operator, exception in parse_license_expression(expression):
+            license = {
+                "attributes": self._attributes(self.NodeLabels.LICENSE, {"name": name}),
+                "__type": self.NodeLabels.LICENSE.value,
+                "__license_id": f"{self.NodeLabels.LICENSE.value}_{name.lower()}",
+            }
+            license["licensed_by"] = [
+                {
+                    "__toId": toId,
+                    "field": field,
+                    "operator": operator,
+                    "exception": exception,
+                    "expression": expression,
+                }
+            ]
+            self.elements.append(license)
+
     @abstractmethod
     def write_document(self):
         raise NotImplementedError
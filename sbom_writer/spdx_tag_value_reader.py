@@ -0,0 +1,229 @@
+import logging
+from pathlib import Path
+
+
+class SPDXTagValueReader:
+    DOCUMENT_TAGS = {
+        "SPDXVersion": "spdxVersion",
+        "DataLicense": "dataLicense",
+        "SPDXID": "SPDXID",
+        "DocumentName": "name",
+        "DocumentNamespace": "documentNamespace",
+        "DocumentComment": "comment",
+    }
+    CREATION_INFO_TAGS = {
+        "Created": "created",
+        "CreatorComment": "comment",
+        "LicenseListVersion": "licenseListVersion",
+    }
+    PACKAGE_TAGS = {
+        "PackageName": "name",
+        "SPDXID": "SPDXID",
+        "PackageVersion": "versionInfo",
+        "PackageFileName": "packageFileName",
+        "PackageSupplier": "supplier",
+        "PackageOriginator": "originator",
+        "PackageDownloadLocation": "downloadLocation",
+        "PackageHomePage": "homepage",
+        "PackageSourceInfo": "sourceInfo",
+        "PackageLicenseConcluded": "licenseConcluded",
+        "PackageLicenseDeclared": "licenseDeclared",
+        "PackageLicenseComments": "licenseComments",
+        "PackageCopyrightText": "copyrightText",
+        "PackageSummary": "summary",
+        "PackageDescription": "description",
+        "PackageComment": "comment",
+        "PrimaryPackagePurpose": "primaryPackagePurpose",
+        "ReleaseDate": "releaseDate",
+        "BuiltDate": "builtDate",
+        "ValidUntilDate": "validUntilDate",
+    }
+    PACKAGE_LIST_TAGS = {
+        "PackageLicenseInfoFromFiles": "licenseInfoFromFiles",
+        "PackageAttributionText": "attributionTexts",
+    }
+    FILE_TAGS = {
+        "FileName": "fileName",
+        "SPDXID": "SPDXID",
+        "LicenseConcluded": "licenseConcluded",
+        "FileCopyrightText": "copyrightText",
+        "FileComment": "comment",
+        "FileNotice": "noticeText",
+        "LicenseComments": "licenseComments",
+    }
+    FILE_LIST_TAGS = {
+        "FileType": "fileTypes",
+        "LicenseInfoInFile": "licenseInfoInFiles",
+        "FileContributor": "fileContributors",
+        "FileAttributionText": "attributionTexts",
+    }
+    LICENSE_TAGS = {
+        "LicenseID": "licenseId",
+        "ExtractedText": "extractedText",
+        "LicenseName": "name",
+        "LicenseComment": "comment",
+    }
+    # Tags which start a new section, and the section they start
+    SECTIONS = {
+        "PackageName": "packages",
+        "FileName": "files",
+        "LicenseID": "hasExtractedLicensingInfos",
+        "SnippetSPDXID": "snippets",
+        "Annotator": "annotations",
+    }
+
+    def __init__(self, path: Path) -> None:
+        """Reads an SPDX tag-value document into the same shape as its JSON representation
+
+        The document is read line by line and each tag is mapped onto the document,
+        or onto the package, file or extracted license section it belongs to.
+        Snippets and annotations are not read.
+
+        Args:
+            path (Path): The path of the tag-value document
+        """
+        self.path = path
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def read(self) -> dict:
+        """Reads the document
+
+        Returns:
+            dict: The BOM in the SPDX JSON shape
+        """
+        bom = {"creationInfo": {"creators": []}, "packages": [], "relationships": []}
+        section, current = None, bom
+        for tag, value in self.__tag_values():
+            if tag in self.SECTIONS:
+                section, current = self.SECTIONS[tag], {}
+                if section not in ("snippets", "annotations"):
+                    bom.setdefault(section, []).append(current)
+
+            if section is None:
+                self.__read_document_tag(bom, tag, value)
+            elif section == "packages":
+                self.__read_package_tag(current, tag, value)
+            elif section == "files":
+                self.__read_tag(current, tag, value, self.FILE_TAGS, self.FILE_LIST_TAGS)
+            elif section == "hasExtractedLicensingInfos":
+                self.__read_tag(current, tag, value, self.LICENSE_TAGS, {})
+
+            if tag == "Relationship":
+                self.__read_relationship(bom, value)
+            elif tag == "RelationshipComment" and len(bom["relationships"]) > 0:
+                bom["relationships"][-1]["comment"] = value
+        return bom
+
+    def __tag_values(self):
+        """Yields the tag and value of each line, joining multi-line <text> values
+
+        Yields:
+            tuple[str, str]: The tag and value
+        """
+        with open(self.path, "r") as f:
+            tag, lines = None, []
+            for line in f:
+                if tag is not None:
+                    lines.append(line.rstrip("\n"))
+                    if "</text>" in line:
+                        yield tag, self.__unwrap("\n".join(lines))
+                        tag, lines = None, []
+                    continue
+
+                line = line.strip()
+                if not line or line.startswith("#") or ":" not in line:
+                    continue
+                key, value = line.split(":", 1)
+                value = value.strip()
+                if value.startswith("<text>") and "</text>" not in value:
+                    tag, lines = key.strip(), [value]
+                    continue
+                yield key.strip(), self.__unwrap(value)
+
+            if tag is not None:
+                self.logger.warning(f"Unterminated <text> value for {tag} in {self.path}")
+
+    def __unwrap(self, value: str) -> str:
+        if value.startswith("<text>"):
+            value = value[len("<text>") :]
+        if value.endswith("</text>"):
+            value = value[: -len("</text>")]
+        return value
+
+    def __read_tag(
+        self, entity: dict, tag: str, value: str, tags: dict, list_tags: dict
+    ) -> bool:
+        if tag in tags:
+            entity[tags[tag]] = value
+        elif tag in list_tags:
+            entity.setdefault(list_tags[tag], []).append(value)
+        elif tag in ("PackageChecksum", "FileChecksum"):
+            algorithm, checksum = value.split(":", 1)
+            entity.setdefault("checksums", []).append(
+                {"algorithm": algorithm.strip(), "checksumValue": checksum.strip()}
+            )
+        elif tag == "LicenseCrossReference":
+            entity.setdefault("seeAlsos", []).append(value)
+        else:
+            return False
+        return True
+
+    def __read_document_tag(self, bom: dict, tag: str, value: str):
+        if tag in self.DOCUMENT_TAGS:
+            bom[self.DOCUMENT_TAGS[tag]] = value
+        elif tag in self.CREATION_INFO_TAGS:
+            bom["creationInfo"][self.CREATION_INFO_TAGS[tag]] = value
+        elif tag == "Creator":
+            bom["creationInfo"]["creators"].append(value)
+        elif tag == "ExternalDocumentRef":
+            id, document, checksum = (value.split(" ", 2) + ["", ""])[:3]
+            algorithm, _, checksum_value = checksum.partition(":")
+            bom.setdefault("externalDocumentRefs", []).append(
+                {
+                    "externalDocumentId": id,
+                    "spdxDocument": document,
+                    "checksum": {
+                        "algorithm": algorithm.strip(),
+                        "checksumValue": checksum_value.strip(),
+                    },
+                }
+            )
+
+    def __read_package_tag(self, package: dict, tag: str, value: str):
+        if self.__read_tag(package, tag, value, self.PACKAGE_TAGS, self.PACKAGE_LIST_TAGS):
+            return
+        if tag == "FilesAnalyzed":
+            package["filesAnalyzed"] = value.lower() == "true"
+        elif tag == "PackageVerificationCode":
+            code, _, excluded = value.partition("(")
+            package["packageVerificationCode"] = {
+                "packageVerificationCodeValue": code.strip()
+            }
+            if excluded:
+                package["packageVerificationCode"][
+                    "packageVerificationCodeExcludedFiles"
+                ] = [excluded.rstrip(")").replace("excludes:", "").strip()]
+        elif tag == "ExternalRef":
+            category, type, locator = (value.split(None, 2) + ["", ""])[:3]
+            package.setdefault("externalRefs", []).append(
+                {
+                    "referenceCategory": category,
+                    "referenceType": type,
+                    "referenceLocator": locator,
+                }
+            )
+        elif tag == "ExternalRefComment" and len(package.get("externalRefs", [])) > 0:
+            package["externalRefs"][-1]["comment"] = value
+
+    def __read_relationship(self, bom: dict, value: str):
+        parts = value.split()
+        if len(parts) != 3:
+            self.logger.warning(f"Skipping malformed relationship {value}")
+            return
+        bom["relationships"].append(
+            {
+                "spdxElementId": parts[0],
+                "relationshipType": parts[1],
+                "relatedSpdxElement": parts[2],
+            }
+        )
@@ -1,9 +1,22 @@
-import uuid
 from typing import Any
 from .sbom_writer import SBOMWriter
 
 
 class SPDXWriter(SBOMWriter):
+    __DOCUMENT_REQUIRED = (
+        "spdxVersion",
+        "created",
+        "packages",
+        "relationships",
+        "documentDescribes",
+    )
+    __PACKAGE_REQUIRED = (
+        "externalRefs",
+        "licenseDeclared",
+        "licenseConcluded",
+        "licenseInfoFromFiles",
+    )
+
     def write_document(self):
         """ "This writes the SPDX document
 
@@ -36,9 +49,18 @@ class SPDXWriter(SBOMWriter):
         Returns:
             dict: The document
         """
-        document_id = f"{self.NodeLabels.DOCUMENT.value}_{uuid.uuid4()}"
+        document_id = self._document_id(bom.get("documentNamespace"))
         document = {
-            "attributes": {**bom, **bom["creationInfo"]},
+            "attributes": {
+                **self._attributes(
+                    self.NodeLabels.DOCUMENT, bom, required=self.__DOCUMENT_REQUIRED
+                ),
+                **self._attributes(
+                    self.NodeLabels.DOCUMENT,
+                    bom["creationInfo"],
+                    required=self.__DOCUMENT_REQUIRED,
+                ),
+            },
             "__type": self.NodeLabels.DOCUMENT.value,
             "__document_id": document_id,
         }
@@ -60,27 +82,22 @@ class SPDXWriter(SBOMWriter):
 
         self.elements.append(document)
 
-    def __write_licenses(self, licenses: Any, toId: str):
-        """Writes the license of the BOM to the graph
+    def __write_licenses(self, licenses: Any, toId: str, field: str):
+        """Writes the license of the BOM to the graph, splitting license expressions into
+        their individual licenses
 
         Args:
             license (Any): The licenses to write
             toId (str): The id of the node to connect to
+            field (str): The field the licenses were read from
         """
         # Adding a ternary operation here to ensure that licenses is a list since it can have a cardinality of 0..N
         licenses = [licenses] if isinstance(licenses, str) else licenses
         for license in licenses:
-            license = {
-                "attributes": {"name": license},
-                "__type": self.NodeLabels.LICENSE.value,
-                "__license_id": f"{self.NodeLabels.LICENSE.value}_{license.lower()}",
-            }
-            license["licensed_by"] = [
-                {
-                    "__toId": toId,
-                }
-            ]
-            self.elements.append(license)
+            if isinstance(license, list):
+                self.__write_licenses(license, toId, field)
+            elif license:
+                self._write_license_expression(license, toId, field)
 
     def __write_packages(self, packages: list):
         """Writes the packages of the BOM to the graph
@@ -91,7 +108,9 @@ class SPDXWriter(SBOMWriter):
 
         for c in packages:
             component = {
-                "attributes": {**c},
+                "attributes": self._attributes(
+                    self.NodeLabels.COMPONENT, c, required=self.__PACKAGE_REQUIRED
+                ),
                 "__type": self.NodeLabels.COMPONENT.value,
                 "__component_id": f"{self.NodeLabels.COMPONENT.value}_{c['SPDXID']}",
             }
@@ -102,7 +121,9 @@ class SPDXWriter(SBOMWriter):
                 for r in component["attributes"]["externalRefs"]:
                     self.elements.append(
                         {
-                            "attributes": {**r},
+                            "attributes": self._attributes(
+                                self.NodeLabels.REFERENCE, r
+                            ),
                             "__type": self.NodeLabels.REFERENCE.value,
                             "__reference_id": f"{self.NodeLabels.REFERENCE.value}_{r['referenceLocator']}",
                         }
@@ -125,18 +146,21 @@ class SPDXWriter(SBOMWriter):
                 self.__write_licenses(
                     [component["attributes"]["licenseDeclared"]],
                     component["__component_id"],
+                    "declared",
                 )
                 self.__remove_attributes_key(component, "licenseDeclared")
             if "licenseConcluded" in component["attributes"]:
                 self.__write_licenses(
                     [component["attributes"]["licenseConcluded"]],
                     component["__component_id"],
+                    "concluded",
                 )
                 self.__remove_attributes_key(component, "licenseConcluded")
             if "licenseInfoFromFiles" in component["attributes"]:
                 self.__write_licenses(
                     [component["attributes"]["licenseInfoFromFiles"]],
                     component["__component_id"],
+                    "infoFromFiles",
                 )
                 self.__remove_attributes_key(component, "licenseInfoFromFiles")
 
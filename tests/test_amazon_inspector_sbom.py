@@ -0,0 +1,203 @@
+import asyncio
+import io
+import json
+import threading
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from amazon_inspector_sbom import AmazonInspectorSBOMExtractor
+
+
+def bom(name: str) -> dict:
+    return {
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "components": [{"type": "library", "name": name, "bom-ref": name}],
+    }
+
+
+class FakeInspector:
+    def __init__(self, statuses: list[str], report_id: str) -> None:
+        self.statuses = statuses
+        self.report_id = report_id
+        self.destinations = []
+
+    def create_sbom_export(self, reportFormat: str, s3Destination: dict) -> dict:
+        self.destinations.append(s3Destination)
+        return {"reportId": self.report_id}
+
+    def get_sbom_export(self, reportId: str) -> dict:
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if callable(status):
+            status = status()
+        return {"reportId": reportId, "status": status}
+
+
+class FakeS3:
+    def __init__(self, objects: dict) -> None:
+        self.objects = objects
+        self.listed = []
+        self.read = []
+
+    def get_paginator(self, operation: str):
+        return self
+
+    def paginate(self, Bucket: str, Prefix: str):
+        self.listed.append((Bucket, Prefix))
+        yield {
+            "Contents": [
+                {"Key": key}
+                for bucket, key in self.objects
+                if bucket == Bucket and key.startswith(Prefix)
+            ]
+        }
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        self.read.append((Bucket, Key))
+        return {"Body": io.BytesIO(json.dumps(self.objects[(Bucket, Key)]).encode())}
+
+
+class FakeSession:
+    def __init__(self, inspector: FakeInspector, s3: FakeS3) -> None:
+        self.clients = {"inspector2": inspector, "s3": s3}
+
+    def client(self, service: str, **kwargs):
+        return self.clients[service]
+
+
+def exported(report_id: str, names: list[str], bucket="bucket", prefix="sbom/") -> dict:
+    return {
+        (bucket, f"{prefix}CYCLONEDX_1_4_outputs_{report_id}/{name}.json"): bom(name)
+        for name in names
+    }
+
+
+def extractor(targets: list[dict], sessions: dict) -> AmazonInspectorSBOMExtractor:
+    extractor = AmazonInspectorSBOMExtractor(
+        "bucket", "sbom/", "arn:aws:kms:key", targets=targets, pollInterval=0.01
+    )
+
+    def create_session(target: dict):
+        session = sessions[target["region"]]
+        if isinstance(session, Exception):
+            raise session
+        return session
+
+    extractor.create_session = create_session
+    return extractor
+
+
+def component_names(elements: list) -> list[str]:
+    return [
+        e["__component_id"].rsplit("_", 1)[-1]
+        for e in elements
+        if e["__type"] == "Component"
+    ]
+
+
+async def extract(extractor: AmazonInspectorSBOMExtractor, on_element=None) -> list:
+    async def run():
+        elements = []
+        async for e in extractor.extract_records():
+            elements.append(e)
+            if on_element is not None:
+                on_element(e)
+        return elements
+
+    return await asyncio.wait_for(run(), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_fast_targets_are_yielded_before_slow_targets_finish():
+    fast_done = threading.Event()
+    slow = FakeInspector(
+        [lambda: "SUCCEEDED" if fast_done.is_set() else "IN_PROGRESS"], "slow"
+    )
+    sessions = {
+        "us-east-1": FakeSession(
+            FakeInspector(["IN_PROGRESS", "SUCCEEDED"], "fast"),
+            FakeS3(exported("fast", ["fast-a", "fast-b"])),
+        ),
+        "us-west-2": FakeSession(slow, FakeS3(exported("slow", ["slow-a"]))),
+    }
+
+    def on_element(e: dict):
+        if e.get("__component_id", "").endswith("fast-b"):
+            fast_done.set()
+
+    elements = await extract(
+        extractor([{"region": "us-west-2"}, {"region": "us-east-1"}], sessions),
+        on_element,
+    )
+    assert component_names(elements) == ["fast-a", "fast-b", "slow-a"]
+
+
+@pytest.mark.asyncio
+async def test_failing_targets_do_not_block_the_others():
+    failed_export = FakeS3(exported("failed", ["failed-a"]))
+    sessions = {
+        "us-east-1": FakeSession(
+            FakeInspector(["SUCCEEDED"], "ok"), FakeS3(exported("ok", ["ok-a"]))
+        ),
+        "us-east-2": RuntimeError("AccessDenied"),
+        "us-west-2": FakeSession(
+            FakeInspector(["IN_PROGRESS", "FAILED"], "failed"), failed_export
+        ),
+    }
+
+    elements = await extract(
+        extractor(
+            [{"region": "us-east-2"}, {"region": "us-west-2"}, {"region": "us-east-1"}],
+            sessions,
+        )
+    )
+    assert component_names(elements) == ["ok-a"]
+    assert failed_export.listed == [] and failed_export.read == []
+
+
+@pytest.mark.asyncio
+async def test_targets_override_the_export_destination():
+    inspector = FakeInspector(["SUCCEEDED"], "report")
+    s3 = FakeS3(exported("report", ["lib"], bucket="other", prefix="team/"))
+    sessions = {"eu-west-1": FakeSession(inspector, s3)}
+
+    elements = await extract(
+        extractor(
+            [{"region": "eu-west-1", "bucketName": "other", "keyPrefix": "team/"}],
+            sessions,
+        )
+    )
+    assert component_names(elements) == ["lib"]
+    assert inspector.destinations == [
+        {"bucketName": "other", "keyPrefix": "team/", "kmsKeyArn": "arn:aws:kms:key"}
+    ]
+    assert s3.listed == [("other", "team/CYCLONEDX_1_4_outputs_report/")]
+
+
+@pytest.mark.asyncio
+async def test_role_sessions_are_created_concurrently(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    def default_session_client(*args, **kwargs):
+        raise AssertionError("The default boto3 session is not thread safe")
+
+    monkeypatch.setattr(boto3, "client", default_session_client)
+    targets = [
+        {"region": region, "roleArn": f"arn:aws:iam::{account:012d}:role/inspector"}
+        for account in range(1, 9)
+        for region in ("us-east-1", "eu-west-1")
+    ]
+    extractor = AmazonInspectorSBOMExtractor("bucket", "sbom/", "arn:aws:kms:key")
+
+    with mock_aws():
+        sessions = await asyncio.gather(
+            *(asyncio.to_thread(extractor.create_session, t) for t in targets)
+        )
+
+    for target, session in zip(targets, sessions):
+        assert session.region_name == target["region"]
+        assert session.get_credentials().access_key != "testing"
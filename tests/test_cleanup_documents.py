@@ -0,0 +1,33 @@
+import re
+import uuid
+
+from nodestream.interpreting.interpretations import SourceNodeInterpretation
+from nodestream.pipeline.value_providers import JmespathValueProvider, ProviderContext
+
+from cleanup_documents import RANDOM_DOCUMENT_ID
+
+
+def stored_document_id(document_id: str) -> str:
+    # Interpret the id the same way the Document source node in pipelines/sbom.yaml does
+    interpretation = SourceNodeInterpretation(
+        node_type="Document",
+        key={"id": JmespathValueProvider.from_string_expression("__document_id")},
+    )
+    context = ProviderContext.fresh({"__document_id": document_id})
+    interpretation.interpret(context)
+    return context.desired_ingest.source.key_values["id"]
+
+
+def test_pattern_matches_stored_random_document_ids():
+    stored = stored_document_id(f"Document_{uuid.uuid4()}")
+    # Cypher =~ matches the whole string, like re.fullmatch
+    assert re.fullmatch(RANDOM_DOCUMENT_ID, stored)
+
+
+def test_pattern_does_not_match_deterministic_document_ids():
+    for document_id in (
+        f"Document_urn:uuid:{uuid.uuid4()}",
+        "Document_sha256:" + "0" * 64,
+        "Document_https://github.com/boto/boto3/dependency_graph/sbom-c3866a4e06384e9a",
+    ):
+        assert not re.fullmatch(RANDOM_DOCUMENT_ID, stored_document_id(document_id))
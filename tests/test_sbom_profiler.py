@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from sbom_profiler import SBOMProfiler, StackSampler
+
+
+def busy(seconds: float) -> list:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return [{"__type": "Component"}, {"__type": "Component"}, None]
+
+
+def hungry() -> list:
+    return [{"__type": "Document", "data": b"x" * (64 * 2**20)}]
+
+
+class CountingTransform:
+    def __init__(self, transform) -> None:
+        self.transform = transform
+        self.calls = 0
+
+    def __call__(self) -> list:
+        self.calls += 1
+        return self.transform()
+
+
+def test_sampler_samples_the_stack_of_a_thread():
+    sampler = StackSampler(threading.get_ident(), 0.005)
+    sampler.start()
+    busy(0.1)
+    samples = sampler.stop()
+
+    assert sum(samples.values()) > 0
+    assert any(stack.split(";")[-1].startswith("busy (") for stack in samples)
+
+
+def test_fast_files_write_nothing(tmp_path):
+    output_dir = tmp_path / "profiles"
+    profiler = SBOMProfiler(
+        {"outputDir": str(output_dir), "timeThreshold": 10, "memoryThreshold": 1024}
+    )
+    transform = CountingTransform(lambda: busy(0.01))
+
+    assert len(profiler.run("data/fast.json", transform)) == 3
+    assert transform.calls == 1
+    assert not output_dir.exists()
+
+
+def test_slow_files_write_samples(tmp_path):
+    profiler = SBOMProfiler(
+        {"outputDir": str(tmp_path), "timeThreshold": 0.05, "memoryThreshold": 1024}
+    )
+    transform = CountingTransform(lambda: busy(0.1))
+    profiler.run("data/slow.json", transform)
+
+    assert transform.calls == 1
+    assert not tracemalloc.is_tracing()
+    assert not list(tmp_path.glob("*.tracemalloc"))
+    (summary,) = tmp_path.glob("*.json")
+    profile = json.loads(summary.read_text())
+    assert profile["source"] == "data/slow.json"
+    assert profile["elapsedSeconds"] > 0.05
+    assert profile["peakMemoryMiB"] < 1024
+    assert profile["elementCounts"] == {"Component": 2}
+    assert profile["samples"] > 0
+    (folded,) = tmp_path.glob("*.folded")
+    assert "busy (" in folded.read_text()
+
+
+def test_each_memory_hungry_file_is_traced(tmp_path):
+    profiler = SBOMProfiler(
+        {"outputDir": str(tmp_path), "timeThreshold": 10, "memoryThreshold": 32}
+    )
+    transform = CountingTransform(hungry)
+    profiler.run("data/first.json", transform)
+    profiler.run("data/fast.json", lambda: busy(0.01))
+    profiler.run("data/second.json", transform)
+
+    assert transform.calls == 2
+    assert not tracemalloc.is_tracing()
+    profiles = {
+        profile["source"]: profile
+        for profile in (json.loads(p.read_text()) for p in tmp_path.glob("*.json"))
+    }
+    assert set(profiles) == {"data/first.json", "data/second.json"}
+    for profile in profiles.values():
+        assert profile["peakMemoryMiB"] >= 64
+        assert "test_sbom_profiler.py" in profile["topAllocations"][0]
+    assert len(list(tmp_path.glob("*.tracemalloc"))) == 2
+    assert tracemalloc.Snapshot.load(str(next(tmp_path.glob("*.tracemalloc"))))
+
+
+def test_profiling_can_be_turned_on_with_defaults():
+    assert SBOMProfiler(True).enabled
+    assert SBOMProfiler(True).memory_threshold is None
+    assert not SBOMProfiler(False).enabled
+    assert not SBOMProfiler().enabled
+    with pytest.raises(TypeError):
+        SBOMProfiler("yes")
+
+
+def test_profiles_of_files_with_the_same_name_do_not_collide(tmp_path):
+    profiler = SBOMProfiler({"outputDir": str(tmp_path), "timeThreshold": 0})
+    for source in ("a/bom.json", "b/bom.json", "b/bom.json"):
+        profiler.run(source, lambda: busy(0.01))
+
+    sources = [json.loads(p.read_text())["source"] for p in tmp_path.glob("*.json")]
+    assert sorted(sources) == ["a/bom.json", "b/bom.json", "b/bom.json"]
+    assert len(list(tmp_path.glob("*.folded"))) == 3
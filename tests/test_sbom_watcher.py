@@ -0,0 +1,127 @@
+import asyncio
+import json
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from sbom import SBOMExtractor
+from sbom_watcher import SBOMWatcher
+
+DATA = Path(__file__).parent.parent / "data"
+
+PATTERNS = ("*.json", "*.xml", "*.spdx")
+
+
+async def collect(watcher: SBOMWatcher, seconds: float, during=None) -> list:
+    changes = []
+
+    async def watch():
+        async for path in watcher.changes():
+            changes.append((path, time.monotonic()))
+
+    task = asyncio.create_task(watch())
+    if during is not None:
+        await during()
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    return changes
+
+
+@pytest.mark.asyncio
+async def test_polling_reports_new_and_edited_files(tmp_path):
+    unchanged = tmp_path / "unchanged.json"
+    unchanged.write_text("{}")
+    edited = tmp_path / "edited.json"
+    edited.write_text("{}")
+    watcher = SBOMWatcher(
+        tmp_path,
+        PATTERNS,
+        known=[unchanged, edited],
+        interval=0.05,
+        settle=0,
+        polling=True,
+    )
+
+    edited.write_text('{"bomFormat": "CycloneDX"}')
+    (tmp_path / "nested").mkdir()
+    added = tmp_path / "nested" / "added.spdx"
+    added.write_text("SPDXVersion: SPDX-2.3")
+    (tmp_path / "notes.txt").write_text("not an SBOM")
+
+    changes = await collect(watcher, 0.3)
+    assert sorted(path for path, _ in changes) == sorted([edited, added])
+
+
+@pytest.mark.asyncio
+async def test_polling_reports_each_change_once(tmp_path):
+    watcher = SBOMWatcher(tmp_path, PATTERNS, interval=0.05, settle=0, polling=True)
+    added = tmp_path / "added.json"
+
+    async def write():
+        added.write_text("{}")
+        await asyncio.sleep(0.2)
+        added.write_text('{"bomFormat": "CycloneDX"}')
+
+    changes = await collect(watcher, 0.3, write)
+    assert [path for path, _ in changes] == [added, added]
+
+
+@pytest.mark.asyncio
+async def test_polling_holds_back_files_until_they_settle(tmp_path):
+    watcher = SBOMWatcher(tmp_path, PATTERNS, interval=0.05, settle=0.3, polling=True)
+    added = tmp_path / "added.json"
+    written = []
+
+    async def write():
+        with open(added, "w") as f:
+            for i in range(5):
+                f.write('{"components": []}\n')
+                f.flush()
+                written.append(time.monotonic())
+                await asyncio.sleep(0.1)
+
+    changes = await collect(watcher, 0.6, write)
+    assert [path for path, _ in changes] == [added]
+    assert changes[0][1] - written[-1] >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_files_added_before_watching_starts_are_reported(tmp_path):
+    pytest.importorskip("watchdog")
+    known = tmp_path / "known.json"
+    known.write_text("{}")
+    watcher = SBOMWatcher(tmp_path, PATTERNS, known=[known], interval=0.05, settle=0)
+
+    # Added while the known files are being read, before changes() is iterated
+    added = tmp_path / "added.json"
+    added.write_text("{}")
+
+    changes = await collect(watcher, 0.3)
+    assert [path for path, _ in changes] == [added]
+
+
+@pytest.mark.asyncio
+async def test_malformed_files_do_not_stop_the_initial_ingest(tmp_path):
+    malformed = {"bomFormat": "CycloneDX", "components": [{"name": "untyped"}]}
+    (tmp_path / "a_malformed.json").write_text(json.dumps(malformed))
+    shutil.copy(DATA / "CDX/drop-wizard-bom.json", tmp_path / "b_valid.json")
+    extractor = SBOMExtractor(
+        tmp_path, watch=True, watchInterval=0.05, watchPolling=True
+    )
+
+    elements = []
+
+    async def extract():
+        async for e in extractor.extract_records():
+            elements.append(e)
+
+    task = asyncio.create_task(extract())
+    await asyncio.sleep(0.3)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert sum(1 for e in elements if e["__type"] == "Document") == 1
@@ -0,0 +1,319 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sbom_writer.__main__ import main
+from sbom_writer.license_expression import parse_license_expression
+from sbom_writer import (
+    AttributeProjection,
+    CycloneDXWriter,
+    CycloneDXXMLReader,
+    SBOMEncoding,
+    SBOMConverter,
+    SBOMFormat,
+    SBOMSniffer,
+    SPDXTagValueReader,
+    SPDXWriter,
+)
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+def read_bom(path: str) -> dict:
+    with open(DATA / path, "r") as f:
+        return json.load(f)
+
+
+def test_projection_excludes_component_attributes():
+    projection = AttributeProjection(
+        {"Component": {"exclude": ["purl", "bom-*"]}, "*": {"include": ["name"]}}
+    )
+    elements = CycloneDXWriter(
+        read_bom("CDX/drop-wizard-bom.json"), projection
+    ).write_document()
+
+    components = [e for e in elements if e["__type"] == "Component"]
+    assert components
+    assert all("purl" not in c["attributes"] for c in components)
+    # The bom-ref is kept as the writer needs it to resolve dependencies
+    assert any("bom-ref" in c["attributes"] for c in components)
+    references = [e for e in elements if e["__type"] == "Reference"]
+    assert all(set(r["attributes"]) <= {"name"} for r in references)
+
+
+def test_projection_keeps_spdx_structure():
+    projection = AttributeProjection(
+        {"Component": {"include": ["name"]}, "Document": {"exclude": ["*"]}}
+    )
+    elements = SPDXWriter(
+        read_bom("SPDX/boto3_boto_6bbdf83ee00b749587f0fe54778fbec5411147b5.json"),
+        projection,
+    ).write_document()
+
+    document = next(e for e in elements if e["__type"] == "Document")
+    assert document["describes"]
+    assert "name" not in document["attributes"]
+    assert "specVersion" in document["attributes"]
+    components = [e for e in elements if e["__type"] == "Component"]
+    assert all(set(c["attributes"]) <= {"name", "purl"} for c in components)
+    assert any(e["__type"] == "License" for e in elements)
+
+
+def test_sniffer_classifies_from_prefix_and_filename(tmp_path):
+    sniffer = SBOMSniffer(prefix_size=512)
+    assert sniffer.sniff(DATA / "CDX/drop-wizard-bom.json") == (
+        SBOMFormat.CYCLONEDX,
+        "1.2",
+        SBOMEncoding.JSON,
+    )
+    assert sniffer.sniff(
+        DATA / "SPDX/boto3_boto_6bbdf83ee00b749587f0fe54778fbec5411147b5.json"
+    ) == (SBOMFormat.SPDX, "2.3", SBOMEncoding.JSON)
+
+    hinted = tmp_path / "host_CYCLONEDX_1_5.json"
+    hinted.write_text("{}")
+    assert sniffer.sniff(hinted) == (SBOMFormat.CYCLONEDX, "1.5", SBOMEncoding.JSON)
+
+    report = tmp_path / "report.json"
+    report.write_text(json.dumps({"findings": [{"id": i} for i in range(1000)]}))
+    assert sniffer.sniff(report) is None
+
+
+def test_document_ids_are_deterministic():
+    def document_id(writer, path):
+        elements = writer(read_bom(path)).write_document()
+        return next(e for e in elements if e["__type"] == "Document")["__document_id"]
+
+    cdx = "CDX/i-0dfd4132c0dd31532_CYCLONEDX_1_4.json"
+    assert document_id(CycloneDXWriter, cdx) == document_id(CycloneDXWriter, cdx)
+    assert document_id(CycloneDXWriter, cdx).startswith("Document_sha256:")
+
+    spdx = "SPDX/boto3_boto_6bbdf83ee00b749587f0fe54778fbec5411147b5.json"
+    assert document_id(SPDXWriter, spdx) == (
+        f"Document_{read_bom(spdx)['documentNamespace']}"
+    )
+
+
+CYCLONEDX_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bom xmlns="http://cyclonedx.org/schema/bom/1.4" version="1">
+  <metadata>
+    <timestamp>2024-01-09T01:27:55Z</timestamp>
+    <tools><tool><vendor>example</vendor><name>scanner</name></tool></tools>
+    <component type="application" bom-ref="app"><name>app</name></component>
+  </metadata>
+  <components>
+    <component type="library" bom-ref="lib">
+      <name>lib</name>
+      <version>1.0</version>
+      <hashes><hash alg="SHA-1">abc</hash></hashes>
+      <licenses><license><id>MIT</id></license></licenses>
+      <externalReferences>
+        <reference type="website"><url>https://example.com</url></reference>
+      </externalReferences>
+    </component>
+  </components>
+  <dependencies>
+    <dependency ref="app"><dependency ref="lib"/></dependency>
+  </dependencies>
+</bom>
+"""
+
+CYCLONEDX_1_5_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<bom xmlns="http://cyclonedx.org/schema/bom/1.5" version="1">
+  <metadata>
+    <tools>
+      <components>
+        <component type="application">
+          <name>scanner</name><version>2.0</version>
+        </component>
+      </components>
+      <services><service><name>api</name></service></services>
+    </tools>
+  </metadata>
+  <components>
+    <component type="library" bom-ref="lib"><name>lib</name></component>
+  </components>
+</bom>
+"""
+
+CYCLONEDX_1_5_JSON = {
+    "bomFormat": "CycloneDX",
+    "specVersion": "1.5",
+    "version": 1,
+    "metadata": {
+        "tools": {
+            "components": [
+                {"type": "application", "name": "scanner", "version": "2.0"}
+            ],
+            "services": [{"name": "api"}],
+        }
+    },
+    "components": [{"type": "library", "bom-ref": "lib", "name": "lib"}],
+}
+
+SPDX_TAG_VALUE = """SPDXVersion: SPDX-2.3
+DataLicense: CC0-1.0
+SPDXID: SPDXRef-DOCUMENT
+DocumentName: app
+DocumentNamespace: https://example.com/app
+Creator: Tool: example
+Created: 2024-01-27T00:19:45Z
+
+PackageName: lib
+SPDXID: SPDXRef-lib
+PackageVersion: 1.0
+PackageLicenseDeclared: MIT
+PackageCopyrightText: <text>Copyright
+Example</text>
+ExternalRef: PACKAGE-MANAGER purl pkg:pypi/lib@1.0
+
+Relationship: SPDXRef-DOCUMENT DESCRIBES SPDXRef-lib
+"""
+
+
+def test_cyclonedx_xml_reader_matches_json_shape(tmp_path):
+    path = tmp_path / "bom.xml"
+    path.write_text(CYCLONEDX_XML)
+    assert SBOMSniffer().sniff(path) == (SBOMFormat.CYCLONEDX, "1.4", SBOMEncoding.XML)
+
+    bom = CycloneDXXMLReader(path).read()
+    assert bom["specVersion"] == "1.4" and bom["version"] == 1
+    assert bom["metadata"]["tools"] == [{"vendor": "example", "name": "scanner"}]
+    assert bom["metadata"]["component"] == {
+        "type": "application",
+        "bom-ref": "app",
+        "name": "app",
+    }
+    assert bom["components"][0]["hashes"] == [{"alg": "SHA-1", "content": "abc"}]
+    assert bom["components"][0]["licenses"] == [{"license": {"id": "MIT"}}]
+    assert bom["dependencies"] == [{"ref": "app", "dependsOn": ["lib"]}]
+
+    elements = CycloneDXWriter(bom).write_document()
+    assert {e["__type"] for e in elements} == {
+        "Document",
+        "Component",
+        "License",
+        "Reference",
+    }
+
+    xml_path = tmp_path / "bom-1.5.xml"
+    xml_path.write_text(CYCLONEDX_1_5_XML)
+    json_path = tmp_path / "bom-1.5.json"
+    json_path.write_text(json.dumps(CYCLONEDX_1_5_JSON))
+    assert CycloneDXXMLReader(xml_path).read() == CYCLONEDX_1_5_JSON
+    converter = SBOMConverter()
+    assert converter.convert(xml_path) == converter.convert(json_path)
+
+
+def test_spdx_tag_value_reader_matches_json_shape(tmp_path):
+    path = tmp_path / "bom.spdx"
+    path.write_text(SPDX_TAG_VALUE)
+    assert SBOMSniffer().sniff(path) == (SBOMFormat.SPDX, "2.3", SBOMEncoding.TAG_VALUE)
+
+    bom = SPDXTagValueReader(path).read()
+    assert bom["creationInfo"]["creators"] == ["Tool: example"]
+    assert bom["packages"][0]["copyrightText"] == "Copyright\nExample"
+    assert bom["packages"][0]["externalRefs"][0]["referenceLocator"] == (
+        "pkg:pypi/lib@1.0"
+    )
+
+    elements = SPDXWriter(bom).write_document()
+    component = next(e for e in elements if e["__type"] == "Component")
+    assert component["attributes"]["purl"] == "pkg:pypi/lib@1.0"
+    document = next(e for e in elements if e["__type"] == "Document")
+    assert {"__toId": "Component_SPDXRef-lib"} in document["describes"]
+
+
+def test_license_expressions_are_split_into_licenses():
+    assert parse_license_expression("(mit or apache-2.0) and bsd-3-clause") == (
+        ("mit", "OR", None),
+        ("apache-2.0", "OR", None),
+        ("bsd-3-clause", "AND", None),
+    )
+    assert parse_license_expression(
+        "GPL-2.0-only WITH Classpath-exception-2.0"
+    ) == (("GPL-2.0-only", None, "Classpath-exception-2.0"),)
+    assert parse_license_expression("MIT AND (") == (("MIT AND (", None, None),)
+
+    bom = {
+        "bomFormat": "CycloneDX",
+        "components": [
+            {
+                "type": "library",
+                "name": "lib",
+                "licenses": [{"expression": "MIT OR Apache-2.0"}],
+            }
+        ],
+    }
+    licenses = [
+        e for e in CycloneDXWriter(bom).write_document() if e["__type"] == "License"
+    ]
+    assert [l["__license_id"] for l in licenses] == [
+        "License_mit",
+        "License_apache-2.0",
+    ]
+    assert licenses[0]["licensed_by"][0]["operator"] == "OR"
+    assert licenses[0]["licensed_by"][0]["expression"] == "MIT OR Apache-2.0"
+
+
+def test_batch_converter_writes_sharded_ndjson(tmp_path):
+    assert main([str(DATA), "-o", str(tmp_path), "-s", "2", "-j", "2"]) == 0
+
+    lines = [
+        json.loads(line)
+        for shard in sorted(tmp_path.glob("part-*.ndjson"))
+        for line in shard.read_text().splitlines()
+    ]
+    assert len(list(tmp_path.glob("part-*.ndjson"))) == 2
+    assert sum(1 for e in lines if e["__type"] == "Document") == 10
+    assert all(
+        not isinstance(v, (dict, list)) or len(v) == 0
+        for e in lines
+        for v in e["attributes"].values()
+    )
+
+
+def test_license_edges_are_keyed_on_their_field():
+    bom = read_bom("SPDX/boto3_boto_6bbdf83ee00b749587f0fe54778fbec5411147b5.json")
+    bom["packages"][0].update(
+        {"licenseDeclared": "MIT OR Apache-2.0", "licenseConcluded": "MIT"}
+    )
+    toId = f"Component_{bom['packages'][0]['SPDXID']}"
+    edges = [
+        (e["__license_id"], edge["field"], edge["expression"], edge["operator"])
+        for e in SPDXWriter(bom).write_document()
+        if e["__type"] == "License"
+        for edge in e["licensed_by"]
+        if edge["__toId"] == toId
+    ]
+    assert edges == [
+        ("License_mit", "declared", "MIT OR Apache-2.0", "OR"),
+        ("License_apache-2.0", "declared", "MIT OR Apache-2.0", "OR"),
+        ("License_mit", "concluded", "MIT", None),
+    ]
+
+    licenses = [
+        e
+        for e in CycloneDXWriter(read_bom("CDX/drop-wizard-bom.json")).write_document()
+        if e["__type"] == "License"
+    ]
+    assert licenses
+    assert all(
+        edge["field"] == "licenses" and edge["expression"]
+        for l in licenses
+        for edge in l["licensed_by"]
+    )
+
+
+def test_batch_converter_rejects_bad_arguments(tmp_path, capsys, caplog):
+    for argv in (["-s", "0"], ["-j", "0"]):
+        with pytest.raises(SystemExit) as exit:
+            main([str(DATA), "-o", str(tmp_path), *argv])
+        assert exit.value.code == 2
+
+    missing = str(tmp_path / "missing")
+    assert main([missing, "-o", str(tmp_path)]) == 1
+    assert main([str(DATA / "CDX"), missing, "-o", str(tmp_path)]) == 1
+    assert "Converted 5 of 5 files" in capsys.readouterr().err
+    assert f"No files found for {missing}" in caplog.text